@@ -0,0 +1,20 @@
+# Result caching: sharded ResultCache and its per-shard eviction policies
+import atexit
+import os
+from cache.policy import POLICIES, ClockCache, CountMinSketch, TinyLFUCache
+from cache.result_cache import (
+    DEFAULT_NUM_SHARDS,
+    IndicatorKeyer,
+    IndicatorSlot,
+    ResultCache,
+)
+from cache.persistent import PersistentResultCache
+
+# Global cache instance; set TA_CACHE_FILE to keep indicator results across restarts
+_cache_file = os.environ.get("TA_CACHE_FILE")
+if _cache_file:
+    global_cache = PersistentResultCache(_cache_file)
+    # Flushes the mapped file on interpreter exit, for both the REST server and MCP stdio mode
+    atexit.register(global_cache.close)
+else:
+    global_cache = ResultCache()
@@ -0,0 +1,211 @@
+import math
+import mmap
+import os
+import struct
+from hashlib import blake2b
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from cache.result_cache import IndicatorKeyer, IndicatorSlot, ResultCache
+
+# File layout: a 16-byte header (magic, record count) followed by fixed-size
+# records of (16-byte key digest, float64 value). The count is written after
+# the record, so a crash mid-append only loses that record.
+_MAGIC = b"TACACHE1"
+_HEADER = struct.Struct("<8sQ")
+_RECORD = struct.Struct("<16sd")
+_MIN_CAPACITY = 4096
+
+
+def _digest(indicator_name: str, key: tuple) -> bytes:
+    """Stable 16-byte digest of an indicator cache key; repr() of the key is deterministic across runs."""
+    return blake2b(repr((indicator_name, key)).encode(), digest_size=16).digest()
+
+
+def _scalar(value: Any) -> Optional[float]:
+    """The float of a {"value": float-or-None} result, NaN for None; None if it can't be stored."""
+    if type(value) is not dict or len(value) != 1 or "value" not in value:
+        return None
+    v = value["value"]
+    if v is None:
+        return math.nan
+    if isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool):
+        return float(v)
+    return None
+
+
+class PersistentResultCache(ResultCache):
+    """
+    ResultCache backed by a memory-mapped append-only file, so a restarted
+    engine serves previously computed final bars without recomputing them.
+    
+    Only single-value indicator results ({"value": float or None}) are
+    written through; anything else stays in memory only. Records are never
+    rewritten, since results of final bars don't change. On an in-memory
+    miss the file index is consulted and a hit is promoted back into memory.
+    After close() the cache keeps working from memory only.
+    """
+    
+    def __init__(self, path: str, **kwargs):
+        """
+        Initialize the cache and rebuild the file index.
+        
+        Args:
+            path: Cache file, created if missing
+            **kwargs: Passed through to ResultCache
+        """
+        super().__init__(**kwargs)
+        self._log_lock = Lock()
+        self._index: Dict[bytes, int] = {}
+        self._file = open(path, "a+b")
+        
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            self._mm = None
+            self._reset()
+        else:
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+            magic, count = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC:
+                self._mm.close()
+                self._file.close()
+                raise ValueError(f"{path} is not an indicator cache file")
+            if _HEADER.size + count * _RECORD.size > size:
+                # Count runs past the end of the file (truncated or torn
+                # header): the records can't be trusted, start over
+                self._reset()
+            else:
+                self._count = count
+                for i in range(count):
+                    offset = _HEADER.size + i * _RECORD.size
+                    self._index[self._mm[offset:offset + 16]] = offset
+    
+    def _load(self, indicator_name: str, key: tuple) -> Optional[Dict[str, Any]]:
+        """Read a result from the file, or None if it was never persisted."""
+        offset = self._index.get(_digest(indicator_name, key))
+        if offset is None:
+            return None
+        with self._log_lock:
+            if self._mm.closed:
+                return None
+            _, value = _RECORD.unpack_from(self._mm, offset)
+        return {"value": None if math.isnan(value) else value}
+    
+    def _append(self, entries: List[Tuple[str, tuple, Any]]):
+        """Append storable (indicator_name, key, value) entries not yet in the file."""
+        with self._log_lock:
+            if self._mm.closed:
+                return
+            for indicator_name, key, value in entries:
+                scalar = _scalar(value)
+                if scalar is None:
+                    continue
+                digest = _digest(indicator_name, key)
+                if digest in self._index:
+                    continue
+                offset = _HEADER.size + self._count * _RECORD.size
+                if offset + _RECORD.size > len(self._mm):
+                    self._grow()
+                _RECORD.pack_into(self._mm, offset, digest, scalar)
+                self._count += 1
+                _HEADER.pack_into(self._mm, 0, _MAGIC, self._count)
+                self._index[digest] = offset
+    
+    def _grow(self):
+        """Double the file's record capacity. Caller holds the log lock."""
+        self._remap(len(self._mm) * 2)
+    
+    def _remap(self, size: int):
+        """Resize the file and map it again. Caller holds the log lock."""
+        if self._mm is not None:
+            self._mm.close()
+        self._file.truncate(size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+    
+    def _reset(self):
+        """Empty the file back to its initial capacity. Caller holds the log lock."""
+        self._remap(_HEADER.size + _MIN_CAPACITY * _RECORD.size)
+        _HEADER.pack_into(self._mm, 0, _MAGIC, 0)
+        self._index.clear()
+        self._count = 0
+    
+    def get_indicator_by_slot(self, slot: IndicatorSlot, params_key: tuple) -> Optional[Any]:
+        result = super().get_indicator_by_slot(slot, params_key)
+        if result is None:
+            result = self._load(slot.indicator_name, slot(params_key))
+            if result is not None:
+                super().set_indicator_by_slot(slot, params_key, result)
+        return result
+    
+    def set_indicator_by_slot(self, slot: IndicatorSlot, params_key: tuple, value: Any):
+        super().set_indicator_by_slot(slot, params_key, value)
+        self._append([(slot.indicator_name, slot(params_key), value)])
+    
+    def get_indicators_bulk(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        params_keys: Dict[str, Optional[tuple]]
+    ) -> Dict[str, Optional[Any]]:
+        results = super().get_indicators_bulk(ticker, day, minute, timeframe, params_keys)
+        promoted = []
+        for indicator_name, result in results.items():
+            params_key = params_keys[indicator_name]
+            if result is None and params_key is not None:
+                result = self._load(indicator_name, (day, minute, ticker, timeframe, params_key))
+                if result is not None:
+                    results[indicator_name] = result
+                    promoted.append((indicator_name, params_key, result))
+        if promoted:
+            super().set_indicators_bulk(ticker, day, minute, timeframe, promoted)
+        return results
+    
+    def set_indicators_bulk(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        entries: List[Tuple[str, Optional[tuple], Any]]
+    ):
+        super().set_indicators_bulk(ticker, day, minute, timeframe, entries)
+        self._append([
+            (indicator_name, (day, minute, ticker, timeframe, params_key), value)
+            for indicator_name, params_key, value in entries
+            if params_key is not None
+        ])
+    
+    def get_indicator_fast(self, keyer: IndicatorKeyer, day: int, minute: int) -> Optional[Any]:
+        result = super().get_indicator_fast(keyer, day, minute)
+        if result is None:
+            result = self._load(keyer.indicator_name, keyer(day, minute))
+            if result is not None:
+                super().set_indicator_fast(keyer, day, minute, result)
+        return result
+    
+    def set_indicator_fast(self, keyer: IndicatorKeyer, day: int, minute: int, value: Any):
+        super().set_indicator_fast(keyer, day, minute, value)
+        self._append([(keyer.indicator_name, keyer(day, minute), value)])
+    
+    def clear(self):
+        """Clear all caches, including the file, which shrinks back to its initial size."""
+        super().clear()
+        with self._log_lock:
+            if not self._mm.closed:
+                self._reset()
+    
+    def close(self):
+        """Flush and close the cache file. Safe to call more than once."""
+        with self._log_lock:
+            if self._mm.closed:
+                return
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["persistent"] = {"records": self._count}
+        return stats
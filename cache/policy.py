@@ -0,0 +1,258 @@
+"""
+Bounded mappings used as the per-shard caches of ResultCache.
+
+All of them expose the same small mapping interface (maxsize, len, in,
+get, item assignment, pop, clear), so ResultCache can pick one by name:
+
+- ClockCache: CLOCK (second-chance) eviction. Reads are lock-free.
+- TinyLFUCache: W-TinyLFU. A small LRU admission window feeds a
+  segmented LRU main region, and an entry only displaces a main-region
+  victim if a count-min sketch has seen it more often. Repeatedly hit
+  series stay resident while one-off scans pass through the window
+  without flushing them.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Union
+
+# Fields of a ClockCache ring node
+_PREV, _NEXT, _KEY, _VALUE, _REF = 0, 1, 2, 3, 4
+
+
+class ClockCache:
+    """
+    Bounded mapping with CLOCK (second-chance) eviction.
+    
+    Reads never reorder anything: a hit only flips the entry's reference bit,
+    so lookups are safe without holding the owning shard's lock. Writes (done
+    under the lock) evict the oldest entry whose bit is clear, giving
+    referenced entries one more pass before they are dropped.
+    
+    Entries live in a plain dict of list nodes threaded on a circular doubly
+    linked list, the layout functools.lru_cache uses, so requeueing a
+    referenced entry is a pointer splice rather than a delete and re-insert.
+    """
+    __slots__ = ('maxsize', '_map', '_root')
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        # key -> [prev, next, key, value, referenced]
+        self._map: Dict[Any, list] = {}
+        # Sentinel: root[_NEXT] is the oldest entry, root[_PREV] the newest
+        self._root: list = []
+        self._root[:] = [self._root, self._root, None, None, False]
+    
+    def __len__(self) -> int:
+        return len(self._map)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._map
+    
+    def get(self, key, default=None):
+        node = self._map.get(key)
+        if node is None:
+            return default
+        node[_REF] = True
+        return node[_VALUE]
+    
+    def __setitem__(self, key, value):
+        node = self._map.get(key)
+        if node is not None:
+            node[_VALUE] = value
+            return
+        if len(self._map) >= self.maxsize:
+            self._evict()
+        root = self._root
+        last = root[_PREV]
+        node = [last, root, key, value, False]
+        last[_NEXT] = root[_PREV] = node
+        self._map[key] = node
+    
+    def _evict(self):
+        root = self._root
+        node = root[_NEXT]
+        while node is not root:
+            prev, nxt = node[_PREV], node[_NEXT]
+            # Unlink from the ring
+            prev[_NEXT] = nxt
+            nxt[_PREV] = prev
+            if not node[_REF]:
+                del self._map[node[_KEY]]
+                return
+            # Second chance: clear the bit and splice back in as the newest
+            node[_REF] = False
+            last = root[_PREV]
+            node[_PREV] = last
+            node[_NEXT] = root
+            last[_NEXT] = root[_PREV] = node
+            node = root[_NEXT]
+    
+    def pop(self, key, default=None):
+        node = self._map.pop(key, None)
+        if node is None:
+            return default
+        prev, nxt = node[_PREV], node[_NEXT]
+        prev[_NEXT] = nxt
+        nxt[_PREV] = prev
+        return node[_VALUE]
+    
+    def clear(self):
+        self._map.clear()
+        root = self._root
+        root[:] = [root, root, None, None, False]
+
+
+# Mixing constants for the sketch rows (odd 64-bit multipliers)
+_SKETCH_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+_MASK64 = (1 << 64) - 1
+# Counters saturate at 15, like the 4-bit counters of the reference design
+_COUNTER_MAX = 15
+# Lookup table that halves every counter of a row in one bytes.translate
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class CountMinSketch:
+    """
+    Approximate access frequencies in `depth` rows of saturating counters.
+    
+    Counters are halved once the number of increments reaches ten times the
+    width, so the estimate favours recent popularity over all-time totals.
+    """
+    __slots__ = ('width', '_rows', '_additions', '_sample_size')
+    
+    def __init__(self, width: int, depth: int = 4):
+        if not 1 <= depth <= len(_SKETCH_SEEDS):
+            raise ValueError(f"depth must be between 1 and {len(_SKETCH_SEEDS)}, got {depth}")
+        self.width = max(1, width)
+        self._rows = [bytearray(self.width) for _ in range(depth)]
+        self._additions = 0
+        self._sample_size = 10 * self.width
+    
+    def _indexes(self, key_hash: int):
+        h = key_hash & _MASK64
+        width = self.width
+        return [(((h * seed) & _MASK64) >> 32) % width for seed in _SKETCH_SEEDS[:len(self._rows)]]
+    
+    def increment(self, key_hash: int):
+        for row, i in zip(self._rows, self._indexes(key_hash)):
+            if row[i] < _COUNTER_MAX:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+    
+    def estimate(self, key_hash: int) -> int:
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key_hash)))
+    
+    def _age(self):
+        for row in self._rows:
+            row[:] = row.translate(_HALVE)
+        self._additions //= 2
+    
+    def clear(self):
+        for row in self._rows:
+            row[:] = bytes(self.width)
+        self._additions = 0
+
+
+class TinyLFUCache:
+    """
+    Bounded mapping with W-TinyLFU admission and eviction.
+    
+    New entries enter an LRU window of about 1% of capacity. Entries
+    leaving the window compete with the main region's LRU victim and
+    are only admitted if the sketch rates them as more frequent. The main
+    region is a segmented LRU: a hit in probation promotes the entry to
+    the protected segment (80% of the main region), whose overflow is
+    demoted back to probation.
+    
+    Unlike ClockCache, a hit reorders segments, so reads take this cache's
+    own lock. Writers already holding the shard lock take it second.
+    """
+    __slots__ = ('maxsize', '_lock', '_sketch', '_window', '_probation', '_protected',
+                 '_window_max', '_main_max', '_protected_max')
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._sketch = CountMinSketch(width=maxsize)
+        self._window: OrderedDict = OrderedDict()
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+        self._window_max = max(1, maxsize // 100)
+        self._main_max = max(0, maxsize - self._window_max)
+        self._protected_max = self._main_max * 4 // 5
+    
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._window or key in self._probation or key in self._protected
+    
+    def get(self, key, default=None):
+        with self._lock:
+            self._sketch.increment(hash(key))
+            for segment in (self._window, self._protected):
+                if key in segment:
+                    segment.move_to_end(key)
+                    return segment[key]
+            if key in self._probation:
+                value = self._probation.pop(key)
+                self._promote(key, value)
+                return value
+            return default
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._sketch.increment(hash(key))
+            for segment in (self._window, self._protected, self._probation):
+                if key in segment:
+                    segment[key] = value
+                    return
+            self._window[key] = value
+            if len(self._window) > self._window_max:
+                self._admit(*self._window.popitem(last=False))
+    
+    def _promote(self, key, value):
+        """Move a probation hit to protected, demoting protected overflow. Caller holds the lock."""
+        protected = self._protected
+        protected[key] = value
+        if len(protected) > self._protected_max:
+            demoted_key, demoted_value = protected.popitem(last=False)
+            self._probation[demoted_key] = demoted_value
+    
+    def _admit(self, key, value):
+        """Offer an entry evicted from the window to the main region. Caller holds the lock."""
+        if len(self._probation) + len(self._protected) < self._main_max:
+            self._probation[key] = value
+            return
+        # Main region full: the candidate must beat its LRU victim on frequency
+        victims = self._probation or self._protected
+        if not victims:
+            return
+        victim = next(iter(victims))
+        if self._sketch.estimate(hash(key)) > self._sketch.estimate(hash(victim)):
+            del victims[victim]
+            self._probation[key] = value
+    
+    def pop(self, key, default=None):
+        with self._lock:
+            for segment in (self._window, self._probation, self._protected):
+                if key in segment:
+                    return segment.pop(key)
+            return default
+    
+    def clear(self):
+        with self._lock:
+            self._window.clear()
+            self._probation.clear()
+            self._protected.clear()
+            self._sketch.clear()
+
+
+# Per-shard cache types ResultCache can be configured with
+BoundedCache = Union[ClockCache, TinyLFUCache]
+POLICIES: Dict[str, Any] = {
+    "clock": ClockCache,
+    "tinylfu": TinyLFUCache,
+}
@@ -0,0 +1,433 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Tuple
+from threading import Lock
+from cache.policy import POLICIES, BoundedCache, ClockCache
+
+# Number of lock stripes; must be a power of two so the shard index is a mask
+DEFAULT_NUM_SHARDS = 64
+
+
+@lru_cache(maxsize=256)
+def _params_key_from_items(items: tuple) -> tuple:
+    """Sorted params key for an items tuple; bounded LRU so long-running engines don't grow."""
+    return tuple(sorted(items))
+
+
+def _make_params_key(params: Dict[str, Any]) -> tuple:
+    """
+    Create a hashable cache key from indicator parameters.
+    
+    Optimized for performance:
+    - Uses a sorted tuple instead of JSON serialization or a frozenset;
+      tuples of a few items hash in a single tight C loop
+    - Works because indicator params are always flat dicts with primitive values
+      and unique string keys (so sorting never compares values)
+    - One- and two-item params (the common case) are ordered inline; larger
+      sorts are memoized on the items tuple by a 256-entry lru_cache, so the
+      memo is keyed by content (never stale) and stays bounded
+    
+    Args:
+        params: Flat dictionary with primitive values (int, float, str, bool)
+        
+    Returns:
+        Tuple of (key, value) pairs sorted by key that can be used as dict key
+    """
+    if not params:
+        return ()
+    items = tuple(params.items())
+    n = len(items)
+    if n == 1:
+        return items
+    if n == 2:
+        first, second = items
+        return items if first[0] < second[0] else (second, first)
+    return _params_key_from_items(items)
+
+
+class IndicatorKeyer:
+    """
+    Cache key builder partially applied to one indicator series.
+    
+    Scanners walking many bars of the same (ticker, timeframe, indicator, params)
+    build the params key once; each call only prepends (day, minute).
+    """
+    __slots__ = ('ticker', 'indicator_name', 'prefix')
+    
+    def __init__(self, ticker: str, timeframe: int, indicator_name: str, params: Dict[str, Any]):
+        self.ticker = ticker
+        self.indicator_name = indicator_name
+        self.prefix = (ticker, timeframe, _make_params_key(params))
+    
+    def __call__(self, day: int, minute: int) -> tuple:
+        return (day, minute) + self.prefix
+
+
+class IndicatorSlot:
+    """
+    Cache slot for one indicator at one bar, with its owning shard resolved.
+    
+    Callers looking up several param sets of the same indicator on the same
+    bar build the slot once; each call only appends the params key.
+    """
+    __slots__ = ('shard', 'indicator_name', 'prefix')
+    
+    def __init__(self, shard, ticker: str, day: int, minute: int, timeframe: int, indicator_name: str):
+        self.shard = shard
+        self.indicator_name = indicator_name
+        self.prefix = (day, minute, ticker, timeframe)
+    
+    def __call__(self, params_key: tuple) -> tuple:
+        return self.prefix + (params_key,)
+
+
+class ResultCache:
+    """
+    L1 cache for computed indicator and pattern results.
+    Only caches results for bars with is_final=True.
+    
+    Entries are striped across independently locked shards keyed by
+    (ticker, day, minute), so concurrent requests for different tickers
+    rarely contend on the same lock, and the minutes of one ticker-day
+    spread evenly over all shards. Only writes take a shard lock; reads are
+    plain dict lookups, which are atomic under the GIL (the "tinylfu"
+    indicator policy additionally locks its own cache on reads).
+    """
+    
+    def __init__(
+        self,
+        max_size_per_indicator: int = 1000,
+        max_size_patterns: int = 2000,
+        max_size_empty_patterns: int = 4096,
+        num_shards: int = DEFAULT_NUM_SHARDS,
+        policy: str = "clock"
+    ):
+        """
+        Initialize the result cache.
+        
+        Args:
+            max_size_per_indicator: Max entries per indicator, across all shards
+            max_size_patterns: Max entries for the pattern cache, across all shards
+            max_size_empty_patterns: Max bars remembered as pattern-free, across all shards (FIFO)
+            num_shards: Number of lock stripes (power of two); each shard
+                gets an equal share of every capacity, rounded up
+            policy: Eviction policy of the indicator caches: "clock" (lock-free
+                reads) or "tinylfu" (frequency-aware admission, locked reads)
+        """
+        if num_shards < 1 or num_shards & (num_shards - 1):
+            raise ValueError(f"num_shards must be a power of two, got {num_shards}")
+        try:
+            self._indicator_cache_cls = POLICIES[policy]
+        except KeyError:
+            raise ValueError(f"Unknown cache policy '{policy}'. Available: {list(POLICIES)}") from None
+        
+        # Configured capacities are totals, split evenly across shards so the
+        # memory bound does not grow with num_shards. Splitting works because
+        # the shard key includes the minute: consecutive minutes of one
+        # ticker-day land in consecutive shards, so a single series can still
+        # fill the whole budget. Bars with no patterns go to a separate
+        # key-only FIFO set, so they don't take pattern-cache slots from bars
+        # with actual hits
+        shard_patterns = -(-max_size_patterns // num_shards)
+        self._shards: Tuple[Tuple[Lock, Dict[str, BoundedCache], ClockCache, OrderedDict], ...] = tuple(
+            (Lock(), {}, ClockCache(maxsize=shard_patterns), OrderedDict())
+            for _ in range(num_shards)
+        )
+        self._shard_mask = num_shards - 1
+        self._max_size_per_indicator = -(-max_size_per_indicator // num_shards)
+        self._max_size_empty_patterns = -(-max_size_empty_patterns // num_shards)
+        # Append-only snapshot of every indicator cache, for lock-free stats
+        self._cache_list: List[Tuple[str, BoundedCache]] = []
+    
+    def _get_shard(self, ticker: str, day: int, minute: int) -> Tuple[Lock, Dict[str, BoundedCache], ClockCache, OrderedDict]:
+        """Select the shard owning all entries for a (ticker, day, minute) bar."""
+        # XOR with a per-ticker-day constant permutes the minute's low bits,
+        # so consecutive minutes cycle through every shard
+        return self._shards[(hash(ticker) ^ day ^ minute) & self._shard_mask]
+    
+    def _get_indicator_cache(self, caches: Dict[str, BoundedCache], indicator_name: str) -> BoundedCache:
+        """Get or create a shard's cache for a specific indicator. Caller holds the shard lock."""
+        cache = caches.get(indicator_name)
+        if cache is None:
+            cache = self._indicator_cache_cls(maxsize=self._max_size_per_indicator)
+            caches[indicator_name] = cache
+            self._cache_list.append((indicator_name, cache))
+        return cache
+    
+    def get_indicator(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        indicator_name: str,
+        params: Dict[str, Any]
+    ) -> Optional[Any]:
+        """
+        Retrieve cached indicator result.
+        
+        Returns:
+            Cached result or None if not found
+        """
+        slot = self.make_slot_key(ticker, day, minute, timeframe, indicator_name)
+        return self.get_indicator_by_slot(slot, _make_params_key(params))
+    
+    def set_indicator(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        indicator_name: str,
+        params: Dict[str, Any],
+        value: Any
+    ):
+        """
+        Store indicator result in cache.
+        Should only be called for bars with is_final=True.
+        """
+        slot = self.make_slot_key(ticker, day, minute, timeframe, indicator_name)
+        self.set_indicator_by_slot(slot, _make_params_key(params), value)
+    
+    def make_slot_key(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        indicator_name: str
+    ) -> IndicatorSlot:
+        """Build a reusable slot for get_indicator_by_slot/set_indicator_by_slot."""
+        return IndicatorSlot(self._get_shard(ticker, day, minute), ticker, day, minute, timeframe, indicator_name)
+    
+    def get_indicator_by_slot(self, slot: IndicatorSlot, params_key: tuple) -> Optional[Any]:
+        """
+        Retrieve cached indicator result using a precomputed slot and params_key().
+        
+        Returns:
+            Cached result or None if not found
+        """
+        cache = slot.shard[1].get(slot.indicator_name)
+        if cache is None:
+            return None
+        return cache.get(slot(params_key))
+    
+    def set_indicator_by_slot(self, slot: IndicatorSlot, params_key: tuple, value: Any):
+        """
+        Store indicator result using a precomputed slot and params_key().
+        Should only be called for bars with is_final=True.
+        """
+        lock, caches, _, _ = slot.shard
+        
+        with lock:
+            cache = self._get_indicator_cache(caches, slot.indicator_name)
+            cache[slot(params_key)] = value
+    
+    @staticmethod
+    def params_key(params: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Canonical cache key for indicator params, or None if they cannot be hashed.
+        
+        Callers doing a lookup and a later store for the same params build
+        the key once here and pass it to the bulk methods.
+        """
+        key = _make_params_key(params)
+        try:
+            # Small keys skip the memoized sort, so check hashability here
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def get_indicators_bulk(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        params_keys: Dict[str, Optional[tuple]]
+    ) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve several indicator results for one bar with a single shard lookup.
+        
+        Args:
+            params_keys: Mapping of indicator name to its params_key();
+                a None key is treated as a miss
+            
+        Returns:
+            Mapping of indicator name to cached result, or None if not found
+        """
+        _, caches, _, _ = self._get_shard(ticker, day, minute)
+        results = {}
+        for indicator_name, params_key in params_keys.items():
+            cache = caches.get(indicator_name)
+            if cache is None or params_key is None:
+                results[indicator_name] = None
+            else:
+                results[indicator_name] = cache.get((day, minute, ticker, timeframe, params_key))
+        return results
+    
+    def set_indicators_bulk(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        entries: List[Tuple[str, Optional[tuple], Any]]
+    ):
+        """
+        Store several indicator results for one bar under a single lock acquisition.
+        Should only be called for bars with is_final=True.
+        
+        Args:
+            entries: (indicator_name, params_key, value) triples; entries
+                with a None key are skipped
+        """
+        lock, caches, _, _ = self._get_shard(ticker, day, minute)
+        with lock:
+            for indicator_name, params_key, value in entries:
+                if params_key is not None:
+                    cache = self._get_indicator_cache(caches, indicator_name)
+                    cache[(day, minute, ticker, timeframe, params_key)] = value
+    
+    def make_indicator_keyer(
+        self,
+        ticker: str,
+        timeframe: int,
+        indicator_name: str,
+        params: Dict[str, Any]
+    ) -> IndicatorKeyer:
+        """Build a reusable keyer for get_indicator_fast/set_indicator_fast."""
+        return IndicatorKeyer(ticker, timeframe, indicator_name, params)
+    
+    def get_indicator_fast(self, keyer: IndicatorKeyer, day: int, minute: int) -> Optional[Any]:
+        """
+        Retrieve cached indicator result using a precomputed keyer.
+        
+        Returns:
+            Cached result or None if not found
+        """
+        _, caches, _, _ = self._get_shard(keyer.ticker, day, minute)
+        cache = caches.get(keyer.indicator_name)
+        if cache is None:
+            return None
+        return cache.get(keyer(day, minute))
+    
+    def set_indicator_fast(self, keyer: IndicatorKeyer, day: int, minute: int, value: Any):
+        """
+        Store indicator result using a precomputed keyer.
+        Should only be called for bars with is_final=True.
+        """
+        lock, caches, _, _ = self._get_shard(keyer.ticker, day, minute)
+        
+        with lock:
+            cache = self._get_indicator_cache(caches, keyer.indicator_name)
+            cache[keyer(day, minute)] = value
+    
+    def get_patterns(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int
+    ) -> Optional[List[Any]]:
+        """
+        Retrieve cached pattern detection results.
+        
+        Returns:
+            List of detected patterns or None if not found
+        """
+        return self.get_patterns_by_key((ticker, day, minute, timeframe))
+    
+    def get_patterns_by_key(self, key: Tuple[str, int, int, int]) -> Optional[List[Any]]:
+        """
+        Retrieve cached pattern results by a prebuilt (ticker, day, minute, timeframe) key.
+        
+        Returns:
+            List of detected patterns or None if not found
+        """
+        _, _, pattern_cache, empty_patterns = self._get_shard(key[0], key[1], key[2])
+        if key in empty_patterns:
+            return []
+        return pattern_cache.get(key)
+    
+    def set_patterns(
+        self,
+        ticker: str,
+        day: int,
+        minute: int,
+        timeframe: int,
+        patterns: List[Any]
+    ):
+        """
+        Store pattern detection results in cache.
+        Should only be called for bars with is_final=True.
+        """
+        self.set_patterns_by_key((ticker, day, minute, timeframe), patterns)
+    
+    def set_patterns_by_key(self, key: Tuple[str, int, int, int], patterns: List[Any]):
+        """
+        Store pattern results under a prebuilt (ticker, day, minute, timeframe) key.
+        Should only be called for bars with is_final=True.
+        """
+        lock, _, pattern_cache, empty_patterns = self._get_shard(key[0], key[1], key[2])
+        
+        with lock:
+            # A key lives in at most one of the two sets, so the last write wins
+            if patterns:
+                empty_patterns.pop(key, None)
+                pattern_cache[key] = patterns
+            else:
+                pattern_cache.pop(key)
+                if key not in empty_patterns:
+                    if len(empty_patterns) >= self._max_size_empty_patterns:
+                        empty_patterns.popitem(last=False)
+                    empty_patterns[key] = None
+    
+    def clear(self):
+        """Clear all caches."""
+        # Caches are emptied in place so _cache_list stays valid
+        for lock, caches, pattern_cache, empty_patterns in self._shards:
+            with lock:
+                for cache in caches.values():
+                    cache.clear()
+                pattern_cache.clear()
+                empty_patterns.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for monitoring, aggregated across shards.
+        
+        Takes no locks: sizes are read from the append-only cache list, so
+        monitoring never stalls writers. Figures are a best-effort snapshot.
+        """
+        indicator_stats: Dict[str, Dict[str, int]] = {}
+        pattern_size = 0
+        pattern_maxsize = 0
+        empty_size = 0
+        
+        # An indicator's caches are created per shard on first write, so its
+        # bound is reported for all shards rather than for those seen so far
+        indicator_maxsize = self._max_size_per_indicator * len(self._shards)
+        for name, cache in list(self._cache_list):
+            entry = indicator_stats.setdefault(name, {"size": 0, "maxsize": indicator_maxsize})
+            entry["size"] += len(cache)
+        
+        for _, _, pattern_cache, empty_patterns in self._shards:
+            pattern_size += len(pattern_cache)
+            pattern_maxsize += pattern_cache.maxsize
+            empty_size += len(empty_patterns)
+        
+        return {
+            "indicator_caches": indicator_stats,
+            "pattern_cache": {
+                "size": pattern_size,
+                "maxsize": pattern_maxsize
+            },
+            "empty_pattern_cache": {
+                "size": empty_size,
+                "maxsize": self._max_size_empty_patterns * len(self._shards)
+            },
+            "num_shards": len(self._shards)
+        }
+
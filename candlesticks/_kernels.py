@@ -0,0 +1,453 @@
+"""
+Numba-compiled scalar kernels for candlestick detection.
+
+Each kernel takes the open/high/low/close arrays of a window, evaluates the
+pattern on the bars ending at the last element, and returns the raw
+confidence, or NaN when the pattern is absent. Keeping the arithmetic here
+takes pandas and interpreter dispatch out of the per-bar detection path.
+
+Kernels are compiled with nogil=True, so they don't hold other threads
+back while they run. They are warmed up at import so the first detection
+call never pays the compile (or cache load) stall.
+
+This module is the native layer for the single-bar CDL-style checks as
+well: each kernel compiles to a handful of scalar float ops, the same code
+a Cython cdef port would produce, without adding an extension build step
+to a project that ships as plain sources.
+"""
+import math
+import numpy as np
+from numba import njit, prange
+
+NO_MATCH = math.nan
+
+# Relative tolerance for "matching" tweezer highs/lows (0.1%)
+TWEEZER_TOL = 1e-3
+
+
+# --- Bearish ---
+
+@njit(cache=True, nogil=True)
+def shooting_star(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    body = abs(cl - op)
+    # Ternaries instead of min()/max(): same result, without builtin call
+    # overhead when the kernel runs interpreted (py_func, NUMBA_DISABLE_JIT)
+    lower_shadow = (cl if cl < op else op) - lo
+    upper_shadow = hi - (cl if cl > op else op)
+    
+    # Long upper shadow (2x+ body), small or no lower shadow (< 0.3x body)
+    if (upper_shadow >= 2 * body) & (lower_shadow <= 0.3 * body) & (body > 0):
+        confidence = upper_shadow / (3 * body)
+        return confidence if confidence < 1.0 else 1.0
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def evening_star(o, h, l, c):
+    o1, c1 = o[-3], c[-3]
+    o2, c2 = o[-2], c[-2]
+    o3, c3 = o[-1], c[-1]
+    
+    # First bar bullish, third bar bearish
+    first_body = c1 - o1
+    if first_body <= 0:
+        return NO_MATCH
+    third_body = c3 - o3
+    if third_body >= 0:
+        return NO_MATCH
+    
+    first_body_abs = abs(first_body)
+    second_body_abs = abs(c2 - o2)
+    third_body_abs = abs(third_body)
+    first_midpoint = (o1 + c1) / 2
+    
+    if (first_body_abs > 1.5 * second_body_abs and
+            third_body_abs > 1.5 * second_body_abs and
+            c3 < first_midpoint):
+        confidence = 0.7 + 0.3 * (first_midpoint - c3) / first_body_abs
+        return confidence if confidence < 1.0 else 1.0
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def bearish_engulfing(o, h, l, c):
+    o1, c1 = o[-2], c[-2]
+    o2, c2 = o[-1], c[-1]
+    
+    # Bullish bar followed by a bearish bar that engulfs its body
+    if c1 <= o1 or c2 >= o2:
+        return NO_MATCH
+    if o2 > c1 and c2 < o1:
+        first_body = abs(c1 - o1)
+        second_body = abs(c2 - o2)
+        confidence = 0.6 + 0.4 * (second_body / first_body - 1)
+        confidence = confidence if confidence < 1.0 else 1.0
+        return confidence if confidence > 0.6 else 0.6
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def three_black_crows(o, h, l, c):
+    # Bar -4 is the context bar, the last three are the potential crows
+    o0, c0 = o[-4], c[-4]
+    o1, c1 = o[-3], c[-3]
+    o2, c2 = o[-2], c[-2]
+    o3, c3 = o[-1], c[-1]
+    
+    # All three crows bearish, closing progressively lower
+    if c1 >= o1 or c2 >= o2 or c3 >= o3:
+        return NO_MATCH
+    if not (c2 < c1 and c3 < c2):
+        return NO_MATCH
+    
+    # Bodies should be relatively large
+    b1, b2, b3 = abs(c1 - o1), abs(c2 - o2), abs(c3 - o3)
+    avg_body = (b1 + b2 + b3) / 3
+    if b1 < 0.5 * avg_body or b2 < 0.5 * avg_body or b3 < 0.5 * avg_body:
+        return NO_MATCH
+    
+    # A strongly bearish context bar means continuation, not reversal
+    context_body = c0 - o0
+    if context_body < 0 and abs(context_body) >= avg_body * 0.7:
+        return NO_MATCH
+    return 0.9
+
+
+@njit(cache=True, nogil=True)
+def bearish_harami(o, h, l, c):
+    o1, c1 = o[-2], c[-2]
+    o2, c2 = o[-1], c[-1]
+    
+    if c1 <= o1:
+        return NO_MATCH
+    if abs(c2 - o2) > 0.5 * abs(c1 - o1):
+        return NO_MATCH
+    if (c2 if c2 > o2 else o2) < c1 and (c2 if c2 < o2 else o2) > o1:
+        return 0.7
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def dark_cloud_cover(o, h, l, c):
+    o1, c1 = o[-2], c[-2]
+    o2, c2 = o[-1], c[-1]
+    
+    # Bullish bar, then a bearish bar gapping above its close
+    if c1 <= o1 or c2 >= o2 or o2 <= c1:
+        return NO_MATCH
+    first_midpoint = (o1 + c1) / 2
+    if c2 < first_midpoint and c2 > o1:
+        return 0.8
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def hanging_man(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    body = abs(cl - op)
+    lower_shadow = (cl if cl < op else op) - lo
+    upper_shadow = hi - (cl if cl > op else op)
+    total_range = hi - lo
+    
+    if ((total_range != 0) & (body > 0) &
+            (lower_shadow >= 2 * body) &
+            (upper_shadow <= lower_shadow * 0.5) &
+            (lower_shadow >= total_range * 0.5)):
+        return 0.65
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def bearish_marubozu(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    if cl >= op:
+        return NO_MATCH
+    total_len = hi - lo
+    if total_len == 0:
+        return NO_MATCH
+    if (op - cl) / total_len > 0.9:
+        return 0.9
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def tweezer_top(o, h, l, c, tol):
+    h1, h2 = h[-2], h[-1]
+    # Highs are almost identical; scaled tolerance instead of a ratio, so a
+    # zero or negative high cannot divide by zero
+    if abs(h1 - h2) <= tol * abs(h1):
+        return 0.75
+    return NO_MATCH
+
+
+# --- Bullish ---
+
+@njit(cache=True, nogil=True)
+def hammer(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    body = abs(cl - op)
+    lower_shadow = (cl if cl < op else op) - lo
+    upper_shadow = hi - (cl if cl > op else op)
+    total_range = hi - lo
+    
+    # Long lower shadow (2x+ body) making up at least half the range,
+    # small upper shadow (< half of lower shadow). The checks are joined with
+    # & rather than `and`, so they compile to one branch instead of a chain
+    # of short-circuit jumps; none of them divides, so evaluating all is safe.
+    if ((total_range != 0) & (body > 0) &
+            (lower_shadow >= 2 * body) &
+            (upper_shadow <= lower_shadow * 0.5) &
+            (lower_shadow >= total_range * 0.5)):
+        # Confidence based on how pronounced the pattern is
+        confidence = 0.6 + 0.1 * (lower_shadow / (body if body > 0.001 else 0.001))
+        return confidence if confidence < 1.0 else 1.0
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def inverted_hammer(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    body = abs(cl - op)
+    upper_shadow = hi - (cl if cl > op else op)
+    lower_shadow = (cl if cl < op else op) - lo
+    
+    # Long upper shadow (>2x body), small lower shadow
+    if (body != 0) & (upper_shadow >= 2 * body) & (lower_shadow <= body * 0.5):
+        return 0.65
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def bullish_marubozu(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    if cl <= op:
+        return NO_MATCH
+    total_len = hi - lo
+    if total_len == 0:
+        return NO_MATCH
+    # Body takes up almost entire range (>90%)
+    if (cl - op) / total_len > 0.9:
+        return 0.9
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def morning_star(o, h, l, c):
+    o1, c1 = o[-3], c[-3]
+    o2, c2 = o[-2], c[-2]
+    o3, c3 = o[-1], c[-1]
+    
+    # First bar bearish, third bar bullish
+    first_body = c1 - o1
+    if first_body >= 0:
+        return NO_MATCH
+    third_body = c3 - o3
+    if third_body <= 0:
+        return NO_MATCH
+    
+    first_body_abs = abs(first_body)
+    second_body_abs = abs(c2 - o2)
+    third_body_abs = abs(third_body)
+    first_midpoint = (o1 + c1) / 2
+    
+    if (first_body_abs > 1.5 * second_body_abs and
+            third_body_abs > 1.5 * second_body_abs and
+            c3 > first_midpoint):
+        confidence = 0.7 + 0.3 * (c3 - first_midpoint) / first_body_abs
+        return confidence if confidence < 1.0 else 1.0
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def bullish_engulfing(o, h, l, c):
+    o1, c1 = o[-2], c[-2]
+    o2, c2 = o[-1], c[-1]
+    
+    # Bearish bar followed by a bullish bar that engulfs its body
+    if c1 >= o1 or c2 <= o2:
+        return NO_MATCH
+    if o2 < c1 and c2 > o1:
+        first_body = abs(c1 - o1)
+        second_body = abs(c2 - o2)
+        confidence = 0.6 + 0.4 * (second_body / first_body - 1)
+        confidence = confidence if confidence < 1.0 else 1.0
+        return confidence if confidence > 0.6 else 0.6
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def three_white_soldiers(o, h, l, c):
+    # Bar -4 is the context bar, the last three are the potential soldiers
+    o0, c0 = o[-4], c[-4]
+    o1, c1 = o[-3], c[-3]
+    o2, c2 = o[-2], c[-2]
+    o3, c3 = o[-1], c[-1]
+    
+    # All three soldiers bullish, with progressively higher closes and opens
+    if c1 <= o1 or c2 <= o2 or c3 <= o3:
+        return NO_MATCH
+    if not (c2 > c1 and c3 > c2):
+        return NO_MATCH
+    if not (o2 > o1 and o3 > o2):
+        return NO_MATCH
+    
+    # Bodies should be relatively large (not dojis)
+    b1, b2, b3 = abs(c1 - o1), abs(c2 - o2), abs(c3 - o3)
+    avg_body = (b1 + b2 + b3) / 3
+    if b1 < 0.5 * avg_body or b2 < 0.5 * avg_body or b3 < 0.5 * avg_body:
+        return NO_MATCH
+    
+    # A strongly bullish context bar means continuation, not reversal
+    context_body = c0 - o0
+    if context_body > 0 and context_body >= avg_body * 0.7:
+        return NO_MATCH
+    return 0.9
+
+
+@njit(cache=True, nogil=True)
+def bullish_harami(o, h, l, c):
+    o1, c1 = o[-2], c[-2]
+    o2, c2 = o[-1], c[-1]
+    
+    # Large bearish bar, then a small body contained within it
+    if c1 >= o1:
+        return NO_MATCH
+    if abs(c2 - o2) > 0.5 * abs(c1 - o1):
+        return NO_MATCH
+    if (c2 if c2 > o2 else o2) < o1 and (c2 if c2 < o2 else o2) > c1:
+        return 0.7
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def piercing_line(o, h, l, c):
+    o1, c1 = o[-2], c[-2]
+    o2, c2 = o[-1], c[-1]
+    
+    # Bearish bar, then a bullish bar gapping below its close
+    if c1 >= o1 or c2 <= o2 or o2 >= c1:
+        return NO_MATCH
+    first_midpoint = (o1 + c1) / 2
+    if c2 > first_midpoint and c2 < o1:
+        return 0.8
+    return NO_MATCH
+
+
+@njit(cache=True, nogil=True)
+def tweezer_bottom(o, h, l, c, tol):
+    l1, l2 = l[-2], l[-1]
+    # Lows are almost identical (within tol of the first low)
+    if abs(l1 - l2) <= tol * abs(l1):
+        return 0.75
+    return NO_MATCH
+
+
+# --- Neutral ---
+
+@njit(cache=True, nogil=True)
+def doji(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    total_range = hi - lo
+    body = abs(cl - op)
+    # Body must be under 10% of range. Most bars fail this, so reject with a
+    # multiply before dividing; it also rejects a zero range.
+    if body * 10.0 >= total_range:
+        return NO_MATCH
+    # Confidence inversely related to body size
+    return 1.0 - (body / total_range / 0.1)
+
+
+@njit(cache=True, nogil=True)
+def spinning_top(o, h, l, c):
+    op, hi, lo, cl = o[-1], h[-1], l[-1], c[-1]
+    body = abs(cl - op)
+    total_range = hi - lo
+    
+    # Small body (under 30% of range), checked without dividing first;
+    # also rejects a zero range
+    if body == 0 or body * 10.0 >= 3.0 * total_range:
+        return NO_MATCH
+    
+    # Both shadows longer than the body and roughly balanced
+    lower_shadow = (cl if cl < op else op) - lo
+    upper_shadow = hi - (cl if cl > op else op)
+    body_ratio = body / total_range
+    longest_shadow = lower_shadow if lower_shadow > upper_shadow else upper_shadow
+    longest_shadow = 0.001 if 0.001 > longest_shadow else longest_shadow
+    shadow_ratio = abs(upper_shadow - lower_shadow) / longest_shadow
+    
+    if (lower_shadow > body) & (upper_shadow > body) & (shadow_ratio < 0.5):
+        balance_score = 1.0 - shadow_ratio
+        size_score = 1.0 - (body_ratio / 0.3)
+        return (balance_score + size_score) / 2
+    return NO_MATCH
+
+
+# Column order of batch_confidences; names match the Pattern.name of each kernel
+BATCH_PATTERNS = (
+    "shooting_star", "hanging_man", "bearish_marubozu", "hammer", "inverted_hammer",
+    "bullish_marubozu", "doji", "spinning_top",
+    "bearish_engulfing", "bearish_harami", "dark_cloud_cover", "tweezer_top",
+    "bullish_engulfing", "bullish_harami", "piercing_line", "tweezer_bottom",
+    "evening_star", "morning_star",
+    "three_black_crows", "three_white_soldiers",
+)
+
+
+@njit(cache=True, parallel=True)
+def batch_confidences(o, h, l, c):
+    """
+    Raw confidence of every built-in pattern at every bar (NaN where absent).
+    
+    Bars are scanned in parallel; each evaluates the same kernels
+    detect_from_arrays uses on the window ending at that bar, gated by the
+    pattern's required_bars. Not part of _warm_up: the parallel build is
+    slow and only full-history scans need it, so it compiles on first use.
+    """
+    n = c.shape[0]
+    out = np.full((n, len(BATCH_PATTERNS)), NO_MATCH)
+    for i in prange(n):
+        end = i + 1
+        wo, wh, wl, wc = o[:end], h[:end], l[:end], c[:end]
+        out[i, 0] = shooting_star(wo, wh, wl, wc)
+        out[i, 1] = hanging_man(wo, wh, wl, wc)
+        out[i, 2] = bearish_marubozu(wo, wh, wl, wc)
+        out[i, 3] = hammer(wo, wh, wl, wc)
+        out[i, 4] = inverted_hammer(wo, wh, wl, wc)
+        out[i, 5] = bullish_marubozu(wo, wh, wl, wc)
+        out[i, 6] = doji(wo, wh, wl, wc)
+        out[i, 7] = spinning_top(wo, wh, wl, wc)
+        if end >= 2:
+            out[i, 8] = bearish_engulfing(wo, wh, wl, wc)
+            out[i, 9] = bearish_harami(wo, wh, wl, wc)
+            out[i, 10] = dark_cloud_cover(wo, wh, wl, wc)
+            out[i, 11] = tweezer_top(wo, wh, wl, wc, TWEEZER_TOL)
+            out[i, 12] = bullish_engulfing(wo, wh, wl, wc)
+            out[i, 13] = bullish_harami(wo, wh, wl, wc)
+            out[i, 14] = piercing_line(wo, wh, wl, wc)
+            out[i, 15] = tweezer_bottom(wo, wh, wl, wc, TWEEZER_TOL)
+        if end >= 3:
+            out[i, 16] = evening_star(wo, wh, wl, wc)
+            out[i, 17] = morning_star(wo, wh, wl, wc)
+        # The three-soldier/crow patterns also require a bar of context
+        if end >= 4:
+            out[i, 18] = three_black_crows(wo, wh, wl, wc)
+            out[i, 19] = three_white_soldiers(wo, wh, wl, wc)
+    return out
+
+
+def _warm_up():
+    """Compile (or load from cache) every kernel for the float64 array signature."""
+    sample = np.ones(4, dtype=np.float64)
+    for kernel in (shooting_star, evening_star, bearish_engulfing, three_black_crows,
+                   bearish_harami, dark_cloud_cover, hanging_man, bearish_marubozu,
+                   hammer, morning_star, bullish_engulfing,
+                   three_white_soldiers, bullish_harami, piercing_line, inverted_hammer, bullish_marubozu,
+                   doji, spinning_top):
+        kernel(sample, sample, sample, sample)
+    for kernel in (tweezer_top, tweezer_bottom):
+        kernel(sample, sample, sample, sample, TWEEZER_TOL)
+
+
+_warm_up()
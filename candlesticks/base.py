@@ -1,64 +1,270 @@
+import math
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
-class Pattern(ABC):
+OHLC_COLUMNS = ('open', 'high', 'low', 'close')
+_REQUIRED_COLUMNS = frozenset(OHLC_COLUMNS)
+_new_tuple = tuple.__new__
+
+
+class PatternHit(NamedTuple):
     """
-    Abstract base class for all candlestick patterns.
+    A detected pattern occurrence.
+    
+    Confidence is stored as an integer percentage (0-100), which compares
+    exactly and avoids float rounding on every hit.
     """
+    name: str
+    classification: str
+    confidence_pct: int
+    bar_index: int
     
     @property
-    @abstractmethod
-    def name(self) -> str:
-        """Unique identifier for the pattern (e.g., 'hammer', 'doji')."""
-        pass
+    def confidence(self) -> float:
+        """Confidence as a fraction (0.0-1.0)."""
+        return self.confidence_pct / 100
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready representation for API responses."""
+        return {
+            'name': self.name,
+            'classification': self.classification,
+            'confidence': self.confidence,
+            'bar_index': self.bar_index
+        }
 
-    @property
-    @abstractmethod
-    def classification(self) -> str:
-        """Classification: 'bullish', 'bearish', or 'neutral'."""
-        pass
 
-    @property
-    @abstractmethod
-    def description(self) -> str:
-        """Human-readable description of the pattern."""
-        pass
+class BarWindow:
+    """
+    A DataFrame of bars together with its OHLC prices as float64 arrays.
+    
+    The prices are extracted once into a (4, n) struct-of-arrays block (rows are
+    open, high, low, close), so every pattern run against the same window
+    slices contiguous arrays instead of re-reading DataFrame columns. Columns
+    are checked here, once, so detectors only need to check the bar count.
+    
+    With `tail`, only the last `tail` bars are copied into the block, for
+    callers that only look at the most recent bars of a long history.
+    """
+    __slots__ = ('df', 'ohlc', 'n')
+    
+    # Last column Index that passed the check. pandas Index objects are
+    # immutable and the reference keeps it alive, so identity means same columns.
+    _checked_columns: Optional[pd.Index] = None
+    
+    def __init__(self, df: pd.DataFrame, tail: Optional[int] = None):
+        columns = df.columns
+        if columns is not BarWindow._checked_columns:
+            if not _REQUIRED_COLUMNS.issubset(columns):
+                missing = [col for col in OHLC_COLUMNS if col not in columns]
+                raise ValueError(f"DataFrame missing required columns: {missing}")
+            BarWindow._checked_columns = columns
+        self.df = df
+        # Columns are pulled one at a time: selecting several columns at once
+        # materializes an intermediate DataFrame, which costs more than the detection.
+        # Each column is sliced before stacking, so only the kept bars are copied.
+        rows = slice(-tail, None) if tail else slice(None)
+        self.ohlc = np.vstack([df[col].to_numpy(dtype=np.float64)[rows] for col in OHLC_COLUMNS])
+        self.n = self.ohlc.shape[1]
+    
+    def __len__(self) -> int:
+        return self.n
 
-    @property
-    def required_bars(self) -> int:
-        """Number of bars needed to detect this pattern (3-5)."""
-        return 3
 
-    @abstractmethod
-    def detect(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+Bars = Union[pd.DataFrame, BarWindow]
+
+
+class BarGeometry:
+    """
+    Candle measurements over OHLC arrays.
+    
+    Each measurement is computed on first use and then shared, so a sweep of
+    many patterns over the same bars reads the price arrays once.
+    
+    Arrays may carry leading batch dimensions, e.g. (tickers, bars); bars are
+    always the last axis and n is their count.
+    """
+    
+    def __init__(self, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray):
+        self.o, self.h, self.l, self.c = o, h, l, c
+        self.n = c.shape[-1]
+    
+    @cached_property
+    def direction(self) -> np.ndarray:
+        """Signed body (close - open)."""
+        return self.c - self.o
+    
+    @cached_property
+    def body(self) -> np.ndarray:
+        return np.abs(self.direction)
+    
+    @cached_property
+    def bullish(self) -> np.ndarray:
+        return self.direction > 0
+    
+    @cached_property
+    def bearish(self) -> np.ndarray:
+        return self.direction < 0
+    
+    @cached_property
+    def body_top(self) -> np.ndarray:
+        return np.maximum(self.o, self.c)
+    
+    @cached_property
+    def body_bottom(self) -> np.ndarray:
+        return np.minimum(self.o, self.c)
+    
+    @cached_property
+    def upper_shadow(self) -> np.ndarray:
+        return self.h - self.body_top
+    
+    @cached_property
+    def lower_shadow(self) -> np.ndarray:
+        return self.body_bottom - self.l
+    
+    @cached_property
+    def total_range(self) -> np.ndarray:
+        return self.h - self.l
+    
+    @cached_property
+    def midpoint(self) -> np.ndarray:
+        """Midpoint of the body."""
+        return (self.o + self.c) / 2
+
+
+class Pattern(ABC):
+    """
+    Abstract base class for all candlestick patterns.
+    
+    Metadata is declared as plain class attributes on each subclass, so
+    reading it is an attribute lookup rather than a property call.
+    """
+    __slots__ = ()
+    
+    # Unique identifier for the pattern (e.g., 'hammer', 'doji')
+    name: str
+    # Classification: 'bullish', 'bearish', or 'neutral'
+    classification: str
+    # Human-readable description of the pattern
+    description: str
+    # Number of bars needed to detect this pattern
+    required_bars: int = 3
+    # (name, classification) prefix shared by every hit, set per subclass
+    _hit_base: Tuple[str, str] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, 'name') and hasattr(cls, 'classification'):
+            cls._hit_base = (cls.name, cls.classification)
+
+    def detect(self, window: Bars) -> Optional[PatternHit]:
         """
         Detect pattern in the most recent bars.
         
         Args:
-            df: Input DataFrame containing market data.
+            window: BarWindow, or a DataFrame containing market data.
                 Must have at least 'open', 'high', 'low', 'close' columns.
                 
         Returns:
-            Detection result dictionary if pattern is found, None otherwise.
-            Format: {
-                'name': str,
-                'classification': str,
-                'confidence': float (0.0-1.0),
-                'bar_index': int (index of the pattern completion bar)
-            }
+            PatternHit if pattern is found, None otherwise.
+            Fields: name, classification, confidence_pct (0-100) and
+            bar_index (index of the pattern completion bar).
+        """
+        o, h, l, c = self.validate_window(window).ohlc
+        return self.detect_from_arrays(o, h, l, c)
+    
+    @abstractmethod
+    def detect_from_arrays(self, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> Optional[PatternHit]:
+        """
+        Detect pattern on the bars ending at the last element of the arrays.
+        
+        Args:
+            o, h, l, c: Equal-length float64 arrays of open, high, low, close,
+                with at least required_bars elements. Detectors only read
+                the tail, so whole-series arrays can be passed without slicing.
+                
+        Returns:
+            PatternHit (bar_index is len(c) - 1) or None.
         """
         pass
     
-    def validate_dataframe(self, df: pd.DataFrame) -> None:
-        """Validate that DataFrame has required columns and enough bars."""
-        required_cols = ['open', 'high', 'low', 'close']
-        missing = [col for col in required_cols if col not in df.columns]
-        if missing:
-            raise ValueError(f"DataFrame missing required columns: {missing}")
+    def detect_vectorized(self, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the pattern at every bar at once.
+        
+        Args:
+            o, h, l, c: Equal-length float arrays of open, high, low, close.
+            
+        Returns:
+            Boolean mask aligned with the input; True where the pattern
+            completes on that bar.
+        """
+        return self.mask_from_geometry(BarGeometry(o, h, l, c))
+    
+    def mask_from_geometry(self, g: BarGeometry) -> np.ndarray:
+        """
+        Vectorized condition over shared candle measurements.
+        
+        The default replays detect_from_arrays() on every prefix of a single series;
+        patterns override it with NumPy expressions over shifted slices of the
+        last axis, which also evaluate batched (tickers, bars) geometry.
+        """
+        mask = np.zeros(g.n, dtype=bool)
+        for i in range(self.required_bars, g.n + 1):
+            mask[i - 1] = self.detect_from_arrays(g.o[:i], g.h[:i], g.l[:i], g.c[:i]) is not None
+        return mask
+    
+    def detect_series(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of bars in df where the pattern completes."""
+        o, h, l, c = BarWindow(df).ohlc
+        return self.detect_vectorized(o, h, l, c)
+    
+    @staticmethod
+    def _pad_mask(cond: np.ndarray, n: int) -> np.ndarray:
+        """Left-pad a condition computed over the last bars to a length-n mask (last axis)."""
+        mask = np.zeros(cond.shape[:-1] + (n,), dtype=bool)
+        mask[..., n - cond.shape[-1]:] = cond
+        return mask
+    
+    def _match(self, confidence: float, bar_index: int) -> Optional[PatternHit]:
+        """Wrap a kernel confidence (NaN when absent) into a detection result."""
+        if math.isnan(confidence):
+            return None
+        # Extend the precomputed (name, classification) prefix; tuple.__new__
+        # skips the NamedTuple constructor's argument binding
+        return _new_tuple(PatternHit, self._hit_base + (int(confidence * 100.0 + 0.5), bar_index))
+    
+    def validate_window(self, window: Bars) -> BarWindow:
+        """
+        Validate that the bars have required columns and enough rows.
+        
+        Returns:
+            The input as a BarWindow, wrapping a plain DataFrame if needed.
+        """
+        # Fast path: a window's columns were validated when it was built
+        if type(window) is BarWindow and window.n >= self.required_bars:
+            return window
         
-        if len(df) < self.required_bars:
+        if not isinstance(window, BarWindow):
+            window = BarWindow(window)
+        
+        if window.n < self.required_bars:
             raise ValueError(
                 f"Pattern '{self.name}' requires at least {self.required_bars} bars, "
-                f"but only {len(df)} provided"
+                f"but only {window.n} provided"
             )
+        return window
+
+
+# Pattern instances in declaration order, filled by @register_pattern as the
+# pattern modules are imported; PatternRegistry is built from this list
+_REGISTRY: List[Pattern] = []
+
+
+def register_pattern(cls):
+    """Class decorator that instantiates a stateless pattern once and records it."""
+    _REGISTRY.append(cls())
+    return cls
@@ -1,12 +1,18 @@
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
+import numpy as np
 import pandas as pd
+from candlesticks import _kernels
+from candlesticks.base import BarGeometry, BarWindow, PatternHit
 from candlesticks.registry import pattern_registry
 
+_by_confidence = attrgetter('confidence_pct')
+
 def detect_patterns(
     df: pd.DataFrame,
     cache: Optional[Any] = None,
     bar_metadata: Optional[Dict[str, Any]] = None
-) -> List[Dict[str, Any]]:
+) -> List[PatternHit]:
     """
     Detect all registered candlestick patterns in the given DataFrame.
     
@@ -18,35 +24,129 @@ def detect_patterns(
         
     Returns:
         List of detected patterns with their metadata.
-        Each pattern dict contains: name, classification, confidence, bar_index
+        Each PatternHit contains: name, classification, confidence, bar_index
     """
-    # Check cache first
+    # Check cache first; the key is built once and reused for the store
     use_cache = cache is not None and bar_metadata is not None
     if use_cache:
-        ticker = bar_metadata['ticker']
-        day = bar_metadata['day']
-        minute = bar_metadata['minute']
-        timeframe = bar_metadata['timeframe']
+        cache_key = (
+            bar_metadata['ticker'],
+            bar_metadata['day'],
+            bar_metadata['minute'],
+            bar_metadata['timeframe']
+        )
         is_final = bar_metadata.get('is_final', False)
         
-        cached_patterns = cache.get_patterns(ticker, day, minute, timeframe)
+        cached_patterns = cache.get_patterns_by_key(cache_key)
         if cached_patterns is not None:
             return cached_patterns
     
-    # Cache miss or no cache - detect patterns
+    # Cache miss or no cache - detect patterns. The columns are validated
+    # once here; the length check is the loop's own break condition.
     detected = []
+    # Detectors only read the tail, so the window holds just the bars the
+    # longest pattern needs; hits are shifted back to their positions in df
+    by_required_bars = pattern_registry.get_patterns_by_required_bars()
+    window = BarWindow(df, tail=by_required_bars[-1].required_bars if by_required_bars else None)
+    n = window.n
+    offset = len(df) - n
+    # Unpack the row views once and hand the same arrays to every detector,
+    # rather than each detect() re-slicing the window
+    o, h, l, c = window.ohlc
     
-    for pattern in pattern_registry.get_all_patterns():
-        if len(df) >= pattern.required_bars:
-            result = pattern.detect(df)
-            if result:
-                detected.append(result)
+    # Patterns ascend by required_bars, so the first one needing more bars
+    # than we have ends the scan
+    for pattern in by_required_bars:
+        if pattern.required_bars > n:
+            break
+        result = pattern.detect_from_arrays(o, h, l, c)
+        if result:
+            detected.append(result._replace(bar_index=result.bar_index + offset) if offset else result)
                 
     # Sort by confidence descending
-    detected.sort(key=lambda x: x['confidence'], reverse=True)
+    detected.sort(key=_by_confidence, reverse=True)
     
     # Store in cache if bar is final
     if use_cache and is_final:
-        cache.set_patterns(ticker, day, minute, timeframe, detected)
+        cache.set_patterns_by_key(cache_key, detected)
     
     return detected
+
+
+def detect_patterns_series(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Evaluate every registered pattern at every bar of the DataFrame.
+    
+    Bar measurements are computed once and shared by all patterns, so a
+    full-history scan is a handful of array operations per pattern instead
+    of one detect_patterns call per bar.
+    
+    Args:
+        df: DataFrame with price data (open, high, low, close)
+        
+    Returns:
+        Boolean DataFrame aligned with df.index, one column per pattern name;
+        True where the pattern completes on that bar.
+    """
+    o, h, l, c = BarWindow(df).ohlc
+    geometry = BarGeometry(o, h, l, c)
+    return pd.DataFrame(
+        {pattern.name: pattern.mask_from_geometry(geometry) for pattern in pattern_registry.get_all_patterns()},
+        index=df.index
+    )
+
+
+def detect_all_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-bar pattern hits plus the best confidence among them.
+    
+    The hit columns come from detect_patterns_series; confidences are then
+    evaluated only on bars where at least one pattern fired, so the scan
+    stays a handful of array operations per pattern.
+    
+    Args:
+        df: DataFrame with price data (open, high, low, close)
+        
+    Returns:
+        detect_patterns_series frame with an extra float 'confidence' column,
+        NaN on bars without any hit.
+    """
+    hits = detect_patterns_series(df)
+    o, h, l, c = BarWindow(df).ohlc
+    patterns = pattern_registry.get_all_patterns()
+    mask = hits.to_numpy()
+    
+    confidence = np.full(len(df), np.nan)
+    for i in np.flatnonzero(mask.any(axis=1)):
+        end = i + 1
+        confidence[i] = max(
+            patterns[j].detect_from_arrays(o[:end], h[:end], l[:end], c[:end]).confidence
+            for j in np.flatnonzero(mask[i])
+        )
+    hits['confidence'] = confidence
+    return hits
+
+
+def detect_patterns_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Confidence of every built-in pattern at every bar, computed in parallel.
+    
+    Runs the same compiled kernels as detect_patterns, with the bars split
+    across threads, for full-history scans that need confidences rather than
+    the boolean hits of detect_patterns_series.
+    
+    Args:
+        df: DataFrame with price data (open, high, low, close)
+        
+    Returns:
+        Float DataFrame aligned with df.index, one column per pattern name in
+        registry order; the raw confidence in [0, 1] where the pattern
+        completes on that bar, NaN elsewhere.
+    """
+    o, h, l, c = BarWindow(df).ohlc
+    confidences = pd.DataFrame(
+        _kernels.batch_confidences(o, h, l, c),
+        columns=_kernels.BATCH_PATTERNS,
+        index=df.index
+    )
+    return confidences[[p.name for p in pattern_registry.get_all_patterns() if p.name in confidences]]
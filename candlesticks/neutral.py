@@ -1,115 +1,48 @@
-from typing import Any, Dict, Optional
-import pandas as pd
-from candlesticks.base import Pattern
+from typing import Optional
+import numpy as np
+from candlesticks import _kernels
+from candlesticks.base import BarGeometry, Pattern, PatternHit, register_pattern
 
+@register_pattern
 class Doji(Pattern):
     """
     Neutral indecision pattern where open and close are nearly equal.
     Indicates potential reversal or continuation depending on context.
     """
-    
-    @property
-    def name(self) -> str:
-        return "doji"
-    
-    @property
-    def classification(self) -> str:
-        return "neutral"
-    
-    @property
-    def description(self) -> str:
-        return "Indecision pattern where open equals close (or very close)"
-    
-    @property
-    def required_bars(self) -> int:
-        return 1
-    
-    def detect(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
-        self.validate_dataframe(df)
-        
-        last = df.iloc[-1]
-        
-        body = abs(last['close'] - last['open'])
-        total_range = last['high'] - last['low']
-        
-        if total_range == 0:
-            return None
-        
-        # Doji criteria: body is very small compared to total range
-        # Typically body should be < 5-10% of total range
-        body_ratio = body / total_range
-        
-        if body_ratio < 0.1:  # Body is less than 10% of range
-            # Confidence inversely related to body size
-            confidence = 1.0 - (body_ratio / 0.1)
-            
-            return {
-                'name': self.name,
-                'classification': self.classification,
-                'confidence': round(confidence, 2),
-                'bar_index': len(df) - 1
-            }
-        
-        return None
+    __slots__ = ()
+    name = "doji"
+    classification = "neutral"
+    description = "Indecision pattern where open equals close (or very close)"
+    required_bars = 1
+    
+    def detect_from_arrays(self, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> Optional[PatternHit]:
+        return self._match(_kernels.doji(o, h, l, c), len(c) - 1)
+    
+    def mask_from_geometry(self, g: BarGeometry) -> np.ndarray:
+        # Same multiply-form bound as the kernel, which also excludes a zero range
+        return g.body * 10.0 < g.total_range
 
 
+@register_pattern
 class SpinningTop(Pattern):
     """
     Neutral indecision pattern with small body and long shadows on both sides.
     Indicates uncertainty in the market.
     """
-    
-    @property
-    def name(self) -> str:
-        return "spinning_top"
-    
-    @property
-    def classification(self) -> str:
-        return "neutral"
-    
-    @property
-    def description(self) -> str:
-        return "Indecision pattern with small body and long upper and lower shadows"
-    
-    @property
-    def required_bars(self) -> int:
-        return 1
-    
-    def detect(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
-        self.validate_dataframe(df)
-        
-        last = df.iloc[-1]
-        
-        body = abs(last['close'] - last['open'])
-        lower_shadow = min(last['open'], last['close']) - last['low']
-        upper_shadow = last['high'] - max(last['open'], last['close'])
-        total_range = last['high'] - last['low']
-        
-        if total_range == 0 or body == 0:
-            return None
-        
-        # Spinning top criteria:
-        # 1. Small body (< 30% of range)
-        # 2. Both shadows are longer than body
-        # 3. Shadows are relatively balanced (not too different)
-        body_ratio = body / total_range
-        shadow_ratio = abs(upper_shadow - lower_shadow) / max(upper_shadow, lower_shadow, 0.001)
-        
-        if (body_ratio < 0.3 and
-            lower_shadow > body and
-            upper_shadow > body and
-            shadow_ratio < 0.5):  # Shadows not too imbalanced
-            
-            # Confidence based on how balanced the pattern is
-            balance_score = 1.0 - shadow_ratio
-            size_score = 1.0 - (body_ratio / 0.3)
-            confidence = (balance_score + size_score) / 2
-            
-            return {
-                'name': self.name,
-                'classification': self.classification,
-                'confidence': round(confidence, 2),
-                'bar_index': len(df) - 1
-            }
-        
-        return None
+    __slots__ = ()
+    name = "spinning_top"
+    classification = "neutral"
+    description = "Indecision pattern with small body and long upper and lower shadows"
+    required_bars = 1
+    
+    def detect_from_arrays(self, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> Optional[PatternHit]:
+        return self._match(_kernels.spinning_top(o, h, l, c), len(c) - 1)
+    
+    def mask_from_geometry(self, g: BarGeometry) -> np.ndarray:
+        body, lower_shadow, upper_shadow, total_range = g.body, g.lower_shadow, g.upper_shadow, g.total_range
+        longest_shadow = np.maximum(np.maximum(upper_shadow, lower_shadow), 0.001)
+        shadow_ratio = np.abs(upper_shadow - lower_shadow) / longest_shadow
+        return ((body != 0) &
+                (body * 10.0 < 3.0 * total_range) &
+                (lower_shadow > body) & (upper_shadow > body) &
+                (shadow_ratio < 0.5))
@@ -1,78 +1,70 @@
-from typing import Dict, List, Type, Any
-from candlesticks.base import Pattern
+from typing import Dict, FrozenSet, List, Tuple, Type, Any
+from candlesticks.base import Pattern, _REGISTRY
 
-# Import pattern classes to register them
-from candlesticks.bullish import (
-    Hammer, MorningStar, BullishEngulfing, 
-    ThreeWhiteSoldiers, BullishHarami, PiercingLine, 
-    InvertedHammer, BullishMarubozu, TweezerBottom
-)
-from candlesticks.bearish import (
-    ShootingStar, EveningStar, BearishEngulfing,
-    ThreeBlackCrows, BearishHarami, DarkCloudCover,
-    HangingMan, BearishMarubozu, TweezerTop
-)
-from candlesticks.neutral import Doji, SpinningTop
+# Importing the pattern modules runs their @register_pattern decorators
+from candlesticks import bullish, bearish, neutral  # noqa: F401
 
 class PatternRegistry:
     def __init__(self):
-        self._patterns: Dict[str, Type[Pattern]] = {}
-        self._instances: Dict[str, Pattern] = {}
-        
-        # Register all known patterns
-        # Bullish
-        self.register(Hammer)
-        self.register(MorningStar)
-        self.register(BullishEngulfing)
-        self.register(ThreeWhiteSoldiers)
-        self.register(BullishHarami)
-        self.register(PiercingLine)
-        self.register(InvertedHammer)
-        self.register(BullishMarubozu)
-        self.register(TweezerBottom)
-        
-        # Bearish
-        self.register(ShootingStar)
-        self.register(EveningStar)
-        self.register(BearishEngulfing)
-        self.register(ThreeBlackCrows)
-        self.register(BearishHarami)
-        self.register(DarkCloudCover)
-        self.register(HangingMan)
-        self.register(BearishMarubozu)
-        self.register(TweezerTop)
-        
-        # Neutral
-        self.register(Doji)
-        self.register(SpinningTop)
+        # Built in one pass from the instances the decorator already created
+        self._patterns: Dict[str, Type[Pattern]] = {p.name: type(p) for p in _REGISTRY}
+        self._instances: Dict[str, Pattern] = {p.name: p for p in _REGISTRY}
+        # Snapshots rebuilt on register() so lookups return them without allocating
+        self._cached_patterns: Tuple[Pattern, ...] = ()
+        self._sorted_by_required_bars: Tuple[Pattern, ...] = ()
+        self._names: FrozenSet[str] = frozenset()
+        self._listing: Tuple[Dict[str, Any], ...] = ()
+        self._refresh_snapshots()
+
+    def _refresh_snapshots(self):
+        self._cached_patterns = tuple(self._instances.values())
+        self._sorted_by_required_bars = tuple(
+            sorted(self._cached_patterns, key=lambda p: p.required_bars)
+        )
+        self._names = frozenset(self._instances)
+        self._listing = tuple(
+            {
+                "name": pat.name,
+                "classification": pat.classification,
+                "description": pat.description,
+                "required_bars": pat.required_bars
+            }
+            for pat in self._cached_patterns
+        )
 
     def register(self, pattern_cls: Type[Pattern]):
         """Register a new pattern class."""
         instance = pattern_cls()
         self._patterns[instance.name] = pattern_cls
         self._instances[instance.name] = instance
+        self._refresh_snapshots()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
 
     def get_pattern(self, name: str) -> Pattern:
         """Get a pattern instance by name."""
-        if name not in self._instances:
-            raise ValueError(f"Pattern '{name}' not found. Available: {list(self._instances.keys())}")
-        return self._instances[name]
+        try:
+            return self._instances[name]
+        except KeyError:
+            raise ValueError(f"Pattern '{name}' not found. Available: {list(self._instances.keys())}") from None
 
     def list_patterns(self) -> List[Dict[str, Any]]:
-        """List all available patterns with metadata."""
-        return [
-            {
-                "name": pat.name,
-                "classification": pat.classification,
-                "description": pat.description,
-                "required_bars": pat.required_bars
-            }
-            for pat in self._instances.values()
-        ]
+        """
+        List all available patterns with metadata.
+        
+        Entries are copied from a snapshot built on register(); they hold
+        only immutable values, so a shallow copy keeps callers apart.
+        """
+        return [dict(entry) for entry in self._listing]
     
-    def get_all_patterns(self) -> List[Pattern]:
+    def get_all_patterns(self) -> Tuple[Pattern, ...]:
         """Get all registered pattern instances."""
-        return list(self._instances.values())
+        return self._cached_patterns
+    
+    def get_patterns_by_required_bars(self) -> Tuple[Pattern, ...]:
+        """Get all registered pattern instances, ascending by required_bars."""
+        return self._sorted_by_required_bars
 
 # Global registry instance
 pattern_registry = PatternRegistry()
@@ -1,41 +1,121 @@
+import asyncio
+import json
 import httpx
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime
 
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+_loads = orjson.loads if HAS_ORJSON else json.loads
+
 class BarsClient:
     REQUIRED_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+    _REQUIRED_SET = frozenset(REQUIRED_COLUMNS)
 
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url.rstrip("/")
+        # One pooled client for the lifetime of this object so repeated fetches
+        # reuse the TCP/TLS connection; HTTP/2 only when the h2 extra is installed.
+        self._client = httpx.Client(base_url=self.base_url, http2=HAS_H2)
 
-    def _validate_df(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Ensure dataframe has required columns and correct types."""
-        if df.empty:
-            return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
-            
-        missing = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
-        if missing:
+    def close(self):
+        """Close the underlying connection pool."""
+        self._client.close()
+
+    def __enter__(self) -> "BarsClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _check_columns(self, payload: Dict[str, Any]) -> None:
+        """Raise if a decoded row or column payload lacks any required column."""
+        if not payload.keys() >= self._REQUIRED_SET:
+            missing = [col for col in self.REQUIRED_COLUMNS if col not in payload]
             raise ValueError(f"Response missing required columns: {missing}")
-            
-        # Ensure standard ordering
-        df = df[self.REQUIRED_COLUMNS + [c for c in df.columns if c not in self.REQUIRED_COLUMNS]]
-        
-        # Ensure timestamp is datetime if it looks like it, or keep as is if int/str? 
-        # The prompt says 'timestamp' in schema. Usually better to parse to datetime for pandas manipulation.
-        # But for strictly stateless "compute" usually we want numeric index or datetime index.
-        # Let's try to convert to datetime if possible, assuming input is ISO or int.
-        # However, the prompt says "No interpolation, resampling...". 
-        # I will keep it simple.
-        return df
 
-    def fetch_bars(self, 
-                   ticker: str, 
-                   day: Optional[int] = None, 
-                   minute: Optional[int] = None, 
-                   limit: int = 100, 
-                   timeframe: int = 1) -> pd.DataFrame:
-        
+    @staticmethod
+    def _ohlcv_block(n: int) -> np.ndarray:
+        """
+        One (5, n) float64 buffer whose rows become the OHLCV columns.
+
+        A single allocation per response instead of one per column; each row
+        is C-contiguous, so kernels take it without a copy. The buffer is
+        owned by the returned frame and never reused across fetches.
+        """
+        return np.empty((5, n), dtype=np.float64)
+
+    def _columns_from_rows(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Transpose a records payload into canonical-order columns.
+
+        OHLCV values are written straight into float64 arrays in one pass, so
+        pandas never has to transpose the row dicts itself. JSON nulls become
+        NaN, as in column payloads.
+        """
+        if rows:
+            self._check_columns(rows[0])
+
+        n = len(rows)
+        timestamps = [None] * n
+        o, h, l, c, v = self._ohlcv_block(n)
+        try:
+            # numpy stores a None assigned into a float64 array as NaN
+            for i, row in enumerate(rows):
+                timestamps[i] = row["timestamp"]
+                o[i] = row["open"]
+                h[i] = row["high"]
+                l[i] = row["low"]
+                c[i] = row["close"]
+                v[i] = row["volume"]
+        except KeyError as e:
+            raise ValueError(f"Response missing required columns: [{e.args[0]!r}]") from None
+
+        # Timestamps are left to pandas inference: ints stay int64, ISO strings stay strings
+        columns = {"timestamp": timestamps, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        if rows:
+            for key in rows[0]:
+                if key not in columns:
+                    columns[key] = [row.get(key) for row in rows]
+        return columns
+
+    def _columns_from_columns(self, data: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Reorder a column-oriented payload, converting OHLCV lists to float64 arrays."""
+        self._check_columns(data)
+
+        columns = {"timestamp": data["timestamp"]}
+        block = self._ohlcv_block(len(data["timestamp"]))
+        for key, row in zip(self.REQUIRED_COLUMNS[1:], block):
+            row[:] = data[key]
+            columns[key] = row
+        for key, values in data.items():
+            if key not in columns:
+                columns[key] = values
+        return columns
+
+    def _columns_from_payload(self, data: Any) -> Dict[str, Any]:
+        """Accept either a list of bar records or a dict of per-column lists."""
+        if isinstance(data, dict):
+            return self._columns_from_columns(data)
+        return self._columns_from_rows(data)
+
+    def _params(self,
+                day: Optional[int],
+                minute: Optional[int],
+                limit: int,
+                timeframe: int) -> Dict[str, int]:
         params = {
             "limit": limit,
             "timeframe": timeframe
@@ -44,16 +124,85 @@ class BarsClient:
             params["day"] = day
         if minute is not None:
             params["minute"] = minute
+        return params
+
+    def _frame_from_payload(self, data: Any) -> pd.DataFrame:
+        if not data:
+            return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
+        return pd.DataFrame(self._columns_from_payload(data), copy=False)
+
+    def _fetch_payload(self,
+                       ticker: str,
+                       day: Optional[int],
+                       minute: Optional[int],
+                       limit: int,
+                       timeframe: int) -> Any:
+        resp = self._client.get(f"/bars/{ticker}", params=self._params(day, minute, limit, timeframe))
+        resp.raise_for_status()
+        return _loads(resp.content)
 
-        url = f"{self.base_url}/bars/{ticker}"
+    def fetch_bars(self, 
+                   ticker: str, 
+                   day: Optional[int] = None, 
+                   minute: Optional[int] = None, 
+                   limit: int = 100, 
+                   timeframe: int = 1) -> pd.DataFrame:
         
-        with httpx.Client() as client:
-            resp = client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            
-        df = pd.DataFrame(data)
-        return self._validate_df(df)
+        return self._frame_from_payload(self._fetch_payload(ticker, day, minute, limit, timeframe))
+
+    def fetch_arrays(self,
+                     ticker: str,
+                     day: Optional[int] = None,
+                     minute: Optional[int] = None,
+                     limit: int = 100,
+                     timeframe: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Fetch bars as a dict of NumPy arrays keyed by column name, skipping the DataFrame.
+
+        The OHLCV arrays are float64 and can be passed directly to
+        Pattern.detect_from_arrays.
+        """
+        data = self._fetch_payload(ticker, day, minute, limit, timeframe)
+        columns = self._columns_from_payload(data or [])
+        return {key: np.asarray(values) for key, values in columns.items()}
+
+    async def _fetch_one(self,
+                         client: httpx.AsyncClient,
+                         ticker: str,
+                         params: Dict[str, int]) -> pd.DataFrame:
+        resp = await client.get(f"/bars/{ticker}", params=params)
+        resp.raise_for_status()
+        return self._frame_from_payload(_loads(resp.content))
+
+    async def _gather(self, tickers: List[str], params: Dict[str, int]) -> Dict[str, pd.DataFrame]:
+        # An AsyncClient is bound to the event loop it was first used on, so
+        # each gather gets its own; requests within it share the pool.
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HAS_H2,
+            limits=httpx.Limits(max_connections=64)
+        ) as client:
+            frames = await asyncio.gather(*(self._fetch_one(client, t, params) for t in tickers))
+        return dict(zip(tickers, frames))
+
+    def fetch_bars_many(self,
+                        tickers: Iterable[str],
+                        day: Optional[int] = None,
+                        minute: Optional[int] = None,
+                        limit: int = 100,
+                        timeframe: int = 1) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch bars for several tickers concurrently.
+
+        Requests are issued together on one async connection pool, so the
+        wall time is roughly one round trip rather than one per ticker.
+        Must not be called from inside a running event loop.
+
+        Returns:
+            Dict mapping each ticker to its bars DataFrame
+        """
+        tickers = list(dict.fromkeys(tickers))
+        return asyncio.run(self._gather(tickers, self._params(day, minute, limit, timeframe)))
 
     def fetch_latest_bars(self, ticker: str, limit: int = 100, timeframe: int = 1) -> pd.DataFrame:
         """Alias for fetch_bars without specific time point."""
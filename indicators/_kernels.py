@@ -0,0 +1,143 @@
+"""
+Numba-compiled kernels for the indicators.
+
+Indicators only report the value at the last bar, so each kernel walks the
+input once and returns that final scalar (NaN when there is not enough
+data) instead of materializing the whole series the way pandas-ta does.
+The matching *_update kernels advance that final state by one bar, so a
+caller streaming bars (Indicator.update) pays O(1) per bar instead of a
+full recompute.
+
+Kernels carry explicit signatures, so they are compiled (or loaded from the
+on-disk cache) eagerly at import rather than on the first request, and are
+specialized for C-contiguous float64 input. Callers pass arrays through
+np.ascontiguousarray, which is free for an already contiguous column.
+"""
+import math
+from numba import float64, int64, njit, types
+
+NO_VALUE = math.nan
+
+# C-contiguous float64 vector, typed read-only: pandas hands out read-only
+# views under copy-on-write, and writable arrays convert to it implicitly
+_VEC = types.Array(float64, 1, 'C', readonly=True)
+_PAIR = types.UniTuple(float64, 2)
+
+
+@njit(_PAIR(float64, float64, float64, int64), cache=True, nogil=True)
+def rsi_update(avg_gain, avg_loss, change, length):
+    """One step of Wilder's smoothing; returns the new (avg_gain, avg_loss)."""
+    gain = change if change > 0 else 0.0
+    loss = -change if change < 0 else 0.0
+    return ((avg_gain * (length - 1) + gain) / length,
+            (avg_loss * (length - 1) + loss) / length)
+
+
+@njit(float64(float64, float64), cache=True, nogil=True)
+def rsi_value(avg_gain, avg_loss):
+    total = avg_gain + avg_loss
+    if total == 0:
+        return NO_VALUE
+    # Ratio first so an all-gain window gives exactly 100
+    return 100.0 * (avg_gain / total)
+
+
+@njit(_PAIR(_VEC, int64), cache=True, nogil=True)
+def rsi_state(close, length):
+    """Smoothed (avg_gain, avg_loss) after the last bar, NaN before the first change."""
+    n = close.shape[0]
+    if length < 1 or n < 2:
+        return NO_VALUE, NO_VALUE
+    
+    # Seed with the first change, like pandas-ta's RMA (an adjust=False
+    # ewm), rather than an SMA of the first `length` changes; the two only
+    # converge after a few hundred bars
+    change = close[1] - close[0]
+    avg_gain = change if change > 0 else 0.0
+    avg_loss = -change if change < 0 else 0.0
+    
+    # Wilder's smoothing over the remaining changes
+    for i in range(2, n):
+        avg_gain, avg_loss = rsi_update(avg_gain, avg_loss, close[i] - close[i - 1], length)
+    return avg_gain, avg_loss
+
+
+@njit(float64(_VEC, int64), cache=True, nogil=True)
+def rsi_last(close, length):
+    # Like pandas-ta, report nothing until there are `length` changes
+    if close.shape[0] < length + 1:
+        return NO_VALUE
+    avg_gain, avg_loss = rsi_state(close, length)
+    return rsi_value(avg_gain, avg_loss)
+
+
+@njit(float64(_VEC, int64), cache=True, nogil=True)
+def sma_last(x, length):
+    n = x.shape[0]
+    if length < 1 or n < length:
+        return NO_VALUE
+    
+    # Only the final window contributes to the last value
+    total = 0.0
+    for i in range(n - length, n):
+        total += x[i]
+    return total / length
+
+
+@njit(float64(float64, float64, int64), cache=True, nogil=True)
+def ema_update(prev, x, length):
+    """One EMA step from the previous value."""
+    alpha = 2.0 / (length + 1)
+    return alpha * x + (1.0 - alpha) * prev
+
+
+@njit(float64(_VEC, int64), cache=True, nogil=True)
+def ema_last(x, length):
+    n = x.shape[0]
+    if length < 1 or n < length:
+        return NO_VALUE
+    
+    # Seed with the SMA of the first `length` values (TA-Lib convention)
+    e = 0.0
+    for i in range(length):
+        e += x[i]
+    e /= length
+    
+    for i in range(length, n):
+        e = ema_update(e, x[i], length)
+    return e
+
+
+@njit(float64(float64, float64, float64), cache=True, nogil=True)
+def _true_range(hi, lo, prev_close):
+    tr = hi - lo
+    up = abs(hi - prev_close)
+    down = abs(prev_close - lo)
+    tr = up if up > tr else tr
+    return down if down > tr else tr
+
+
+@njit(float64(float64, float64, float64, float64, int64), cache=True, nogil=True)
+def atr_update(prev, hi, lo, prev_close, length):
+    """One RMA step of the true range from the previous ATR."""
+    alpha = 1.0 / length
+    return alpha * _true_range(hi, lo, prev_close) + (1.0 - alpha) * prev
+
+
+@njit(float64(_VEC, _VEC, _VEC, int64), cache=True, nogil=True)
+def atr_last(high, low, close, length):
+    n = close.shape[0]
+    if length < 1 or n < length:
+        return NO_VALUE
+    
+    # True range of the first bar has no previous close, so it is high - low;
+    # average the first `length` of them as the seed
+    e = high[0] - low[0]
+    for i in range(1, length):
+        e += _true_range(high[i], low[i], close[i - 1])
+    e /= length
+    
+    # Wilder's moving average (RMA) over the remaining bars
+    for i in range(length, n):
+        e = atr_update(e, high[i], low[i], close[i - 1], length)
+    return e
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel
 
@@ -8,6 +10,13 @@ class Indicator(ABC):
     Abstract base class for all technical indicators.
     """
     
+    # Distinct param sets memoized per instance by validate_params()
+    _MAX_MEMOIZED_PARAMS = 128
+    
+    # Type of the state initial_state()/update() pass around; None means the
+    # indicator has no incremental updates and both raise NotImplementedError
+    state_cls: Optional[type] = None
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -42,12 +51,14 @@ class Indicator(ABC):
         return {"value": "float"}
 
     @abstractmethod
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
         """
         Compute the indicator.
         
         Args:
             df: Input DataFrame containing market data.
+            arrays: Optional float64 column arrays already extracted from df,
+                shared across indicators by compute_indicators.
             **params: Indicator-specific parameters.
             
         Returns:
@@ -56,8 +67,59 @@ class Indicator(ABC):
         """
         pass
     
-    def validate_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Merge provided params with defaults."""
+    def initial_state(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Any:
+        """
+        Streaming state after the last bar of df, to be advanced with update().
+        
+        Only indicators with an O(1) per-bar recurrence implement this (those
+        with a state_cls). df may be shorter than the indicator's length, or
+        empty: update() then reports None until enough bars have been seen.
+        """
+        raise NotImplementedError(f"Indicator '{self.name}' does not support incremental updates")
+    
+    def update(self, state: Any, bar: Dict[str, float], **params) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Advance a streaming state by one new bar.
+        
+        Args:
+            state: Value from initial_state() or a previous update()
+            bar: The new bar's OHLCV fields
+            **params: The same parameters the state was built with
+            
+        Returns:
+            (new_state, result), result shaped like compute()'s
+        """
+        raise NotImplementedError(f"Indicator '{self.name}' does not support incremental updates")
+    
+    @staticmethod
+    def _column(df: pd.DataFrame, col: str, arrays: Optional[Dict[str, np.ndarray]]) -> np.ndarray:
+        """Column as a contiguous float64 array, taken from the shared arrays when available."""
+        if arrays is not None and col in arrays:
+            return arrays[col]
+        return np.ascontiguousarray(df[col].to_numpy(dtype=np.float64, copy=False))
+    
+    def validate_params(self, params: Dict[str, Any]) -> Mapping[str, Any]:
+        """
+        Merge provided params with defaults.
+        
+        Results are memoized per instance and distinct param set, and handed
+        out as read-only views so no caller can change what later calls see.
+        """
+        try:
+            # Keyed on value types too, so length=True doesn't hit length=1
+            key = frozenset((k, type(v), v) for k, v in params.items()) if params else frozenset()
+            memo = self.__dict__.setdefault('_params_memo', {})
+            merged = memo.get(key)
+        except TypeError:
+            # Unhashable param values (e.g. lists) cannot be memoized
+            return self._merge_params(params)
+        if merged is None:
+            merged = MappingProxyType(self._merge_params(params))
+            if len(memo) < self._MAX_MEMOIZED_PARAMS:
+                memo[key] = merged
+        return merged
+    
+    def _merge_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         final_params = self.default_params.copy()
         if params:
             final_params.update(params)
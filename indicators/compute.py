@@ -1,7 +1,60 @@
-from typing import Any, Dict, List, Optional
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from indicators.registry import registry
 
+_ARRAY_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Bound once so the per-indicator lookup skips the attribute resolution
+_get_indicator = registry.get_indicator
+
+# Output precision, selectable per request with a "precision" param. Values
+# are reported in full float64 by default; "f32" opts into float32-rounded
+# output while kernels still accumulate in float64
+_PRECISIONS = ('f32', 'f64')
+_DEFAULT_PRECISION = 'f64'
+
+
+def _extract_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Pull the OHLCV columns out of the frame once per request.
+    
+    Columns that are missing or not numeric are left out; indicators then
+    read them from df themselves and report their own error.
+    """
+    arrays = {}
+    for col in _ARRAY_COLUMNS:
+        if col in df.columns:
+            try:
+                arrays[col] = np.ascontiguousarray(df[col].to_numpy(dtype=np.float64, copy=False))
+            except (TypeError, ValueError):
+                pass
+    return arrays
+
+
+def _narrow(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Round float outputs to float32 precision, keeping float32's shortest repr (e.g. 0.1, not 0.10000000149011612)."""
+    return {k: float(str(np.float32(v))) if type(v) is float else v for k, v in result.items()}
+
+
+def _compute_one(
+    name: str,
+    params: Dict[str, Any],
+    df: pd.DataFrame,
+    arrays: Dict[str, np.ndarray]
+) -> Tuple[Dict[str, Any], bool]:
+    """Compute one indicator; a raised exception becomes an error entry flagged as failed."""
+    try:
+        precision = params.get('precision', _DEFAULT_PRECISION)
+        if precision not in _PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}'. Available: {list(_PRECISIONS)}")
+        result = _get_indicator(name).compute(df, arrays=arrays, **params)
+        return (_narrow(result) if precision == 'f32' else result), True
+    except Exception as e:
+        return {"error": str(e)}, False
+
+
 def compute_indicators(
     df: pd.DataFrame,
     indicators: Dict[str, Dict[str, Any]],
@@ -15,6 +68,8 @@ def compute_indicators(
         df: The market data DataFrame.
         indicators: Dictionary mapping indicator names to their parameters.
                     e.g. {'rsi': {'length': 14}, 'sma': {'length': 50}}
+                    Any indicator accepts precision='f32' to get values rounded
+                    to float32 instead of the default full float64 ones.
         cache: Optional ResultCache instance for caching results
         bar_metadata: Optional metadata about the target bar:
                      {'ticker': str, 'day': int, 'minute': int, 'timeframe': int, 'is_final': bool}
@@ -22,40 +77,80 @@ def compute_indicators(
     Returns:
         Dictionary mapping indicator names to their computed results.
     """
+    if cache is None or bar_metadata is None:
+        return _compute_plain(df, indicators)
+    return _compute_cached(
+        df,
+        indicators,
+        cache,
+        bar_metadata['ticker'],
+        bar_metadata['day'],
+        bar_metadata['minute'],
+        bar_metadata['timeframe'],
+        bar_metadata.get('is_final', False)
+    )
+
+
+def _compute_misses(
+    df: pd.DataFrame,
+    misses: List[Tuple[str, Dict[str, Any]]]
+) -> List[Tuple[Dict[str, Any], bool]]:
+    """
+    Compute (name, params) pairs in request order.
+    
+    Runs inline: each kernel takes microseconds, so handing them to a thread
+    pool costs more than the work itself.
+    """
+    if not misses:
+        return []
+    # Column arrays are extracted once and shared by every indicator
+    arrays = _extract_arrays(df)
+    return [_compute_one(name, params, df, arrays) for name, params in misses]
+
+
+def _compute_plain(df: pd.DataFrame, indicators: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """compute_indicators without a cache: every indicator is computed."""
+    misses = [(sys.intern(name), ind_params or {}) for name, ind_params in indicators.items()]
+    computed = _compute_misses(df, misses)
+    return {name: res for (name, _), (res, _) in zip(misses, computed)}
+
+
+def _compute_cached(
+    df: pd.DataFrame,
+    indicators: Dict[str, Dict[str, Any]],
+    cache: Any,
+    ticker: str,
+    day: int,
+    minute: int,
+    timeframe: int,
+    is_final: bool
+) -> Dict[str, Any]:
+    """compute_indicators with a cache: serve hits, compute misses, store if final."""
     results = {}
     
-    # Extract metadata for caching
-    use_cache = cache is not None and bar_metadata is not None
-    if use_cache:
-        ticker = bar_metadata['ticker']
-        day = bar_metadata['day']
-        minute = bar_metadata['minute']
-        timeframe = bar_metadata['timeframe']
-        is_final = bar_metadata.get('is_final', False)
-    
-    for name, ind_params in indicators.items():
-        try:
-            # Check cache first
-            if use_cache:
-                cached_result = cache.get_indicator(
-                    ticker, day, minute, timeframe, name, ind_params or {}
-                )
-                if cached_result is not None:
-                    results[name] = cached_result
-                    continue
-            
-            # Cache miss or no cache - compute
-            indicator = registry.get_indicator(name)
-            res = indicator.compute(df, **(ind_params or {}))
-            results[name] = res
-            
-            # Store in cache if bar is final
-            if use_cache and is_final:
-                cache.set_indicator(
-                    ticker, day, minute, timeframe, name, ind_params or {}, res
-                )
-                
-        except Exception as e:
-            results[name] = {"error": str(e)}
-            
+    # Serve cache hits first with one bulk lookup; canonical params keys are
+    # built once and reused for the store
+    requests = {sys.intern(name): ind_params or {} for name, ind_params in indicators.items()}
+    params_keys = {name: cache.params_key(params) for name, params in requests.items()}
+    cached = cache.get_indicators_bulk(ticker, day, minute, timeframe, params_keys)
+    
+    misses = []
+    for name, params in requests.items():
+        cached_result = cached[name]
+        if cached_result is not None:
+            results[name] = cached_result
+        else:
+            results[name] = None  # Placeholder keeps the request's key order
+            misses.append((name, params))
+    
+    fresh = []
+    for (name, _), (res, ok) in zip(misses, _compute_misses(df, misses)):
+        results[name] = res
+        if ok:
+            fresh.append((name, params_keys[name], res))
+    
+    # Store in cache if bar is final, all under one shard lock
+    if is_final and fresh:
+        cache.set_indicators_bulk(ticker, day, minute, timeframe, fresh)
+    
     return results
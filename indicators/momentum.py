@@ -1,9 +1,20 @@
-from typing import Dict, Any
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import math
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from . import _kernels
 from .base import Indicator
 
+class RSIState(NamedTuple):
+    """Wilder-smoothed averages, the close they were last advanced to, and the bars seen so far."""
+    avg_gain: float
+    avg_loss: float
+    prev_close: float
+    bars: int
+
 class RSI(Indicator):
+    state_cls = RSIState
+
     @property
     def name(self) -> str:
         return "rsi"
@@ -20,21 +31,43 @@ class RSI(Indicator):
     def default_params(self) -> Dict[str, Any]:
         return {"length": 14}
 
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
         p = self.validate_params(params)
         length = p.get("length", p.get("period", 14)) # Handle both names for flexibility
         
         if len(df) < length:
             return {"value": None}
 
-        # pandas-ta adds the result as a series
-        rsi_series = df.ta.rsi(length=length)
-        
-        if rsi_series is None or rsi_series.empty:
-            return {"value": None}
-            
-        val = rsi_series.iloc[-1]
+        close = self._column(df, "close", arrays)
+        val = _kernels.rsi_last(close, int(length))
         
         return {
-            "value": float(val) if pd.notnull(val) else None
+            "value": None if math.isnan(val) else float(val)
         }
+
+    def initial_state(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> RSIState:
+        p = self.validate_params(params)
+        length = p.get("length", p.get("period", 14))
+        
+        # Averages are NaN before the first change; values are reported
+        # once length + 1 bars have been seen, as in compute()
+        close = self._column(df, "close", arrays)
+        avg_gain, avg_loss = _kernels.rsi_state(close, int(length))
+        return RSIState(avg_gain, avg_loss, float(close[-1]) if close.size else math.nan, close.size)
+
+    def update(self, state: RSIState, bar: Dict[str, float], **params) -> Tuple[RSIState, Dict[str, Any]]:
+        p = self.validate_params(params)
+        length = p.get("length", p.get("period", 14))
+        
+        close = float(bar["close"])
+        if state.bars == 0:
+            avg_gain = avg_loss = math.nan
+        elif state.bars == 1:
+            # The first change seeds the averages, as in rsi_state
+            change = close - state.prev_close
+            avg_gain, avg_loss = max(change, 0.0), max(-change, 0.0)
+        else:
+            avg_gain, avg_loss = _kernels.rsi_update(state.avg_gain, state.avg_loss, close - state.prev_close, int(length))
+        bars = state.bars + 1
+        val = _kernels.rsi_value(avg_gain, avg_loss) if bars > length else math.nan
+        return RSIState(avg_gain, avg_loss, close, bars), {"value": None if math.isnan(val) else float(val)}
@@ -1,4 +1,6 @@
-from typing import Dict, List, Type, Any
+import sys
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple, Type, Any
 from indicators.base import Indicator
 # Import your indicators here to register them
 from indicators.momentum import RSI
@@ -8,8 +10,13 @@ from indicators.volume import VolumeSMA, CVD
 
 class IndicatorRegistry:
     def __init__(self):
-        self._indicators: Dict[str, Type[Indicator]] = {}
-        self._instances: Dict[str, Indicator] = {}
+        # Read-only views over frozen dicts keyed by interned names; register()
+        # swaps in new views rather than mutating them
+        self._indicators: Mapping[str, Type[Indicator]] = MappingProxyType({})
+        self._instances: Mapping[str, Indicator] = MappingProxyType({})
+        # Snapshots rebuilt on register() so lookups return them without allocating
+        self._names: FrozenSet[str] = frozenset()
+        self._listing: Tuple[Dict[str, Any], ...] = ()
         
         # Register known indicators
         self.register(RSI)
@@ -22,18 +29,11 @@ class IndicatorRegistry:
     def register(self, indicator_cls: Type[Indicator]):
         """Register a new indicator class."""
         instance = indicator_cls()
-        self._indicators[instance.name] = indicator_cls
-        self._instances[instance.name] = instance
-
-    def get_indicator(self, name: str) -> Indicator:
-        """Get an indicator instance by name."""
-        if name not in self._instances:
-            raise ValueError(f"Indicator '{name}' not found. Available: {list(self._instances.keys())}")
-        return self._instances[name]
-
-    def list_indicators(self) -> List[Dict[str, Any]]:
-        """List all available indicators with metadata."""
-        return [
+        name = sys.intern(instance.name)
+        self._indicators = MappingProxyType({**self._indicators, name: indicator_cls})
+        self._instances = MappingProxyType({**self._instances, name: instance})
+        self._names = frozenset(self._instances)
+        self._listing = tuple(
             {
                 "name": ind.name,
                 "category": ind.category,
@@ -43,6 +43,33 @@ class IndicatorRegistry:
                 "output_schema": ind.output_schema
             }
             for ind in self._instances.values()
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def get_indicator(self, name: str) -> Indicator:
+        """Get an indicator instance by name."""
+        try:
+            return self._instances[name]
+        except KeyError:
+            raise ValueError(f"Indicator '{name}' not found. Available: {list(self._instances.keys())}") from None
+
+    def list_indicators(self) -> List[Dict[str, Any]]:
+        """
+        List all available indicators with metadata.
+        
+        Entries are copied from a snapshot built on register(), including
+        the nested params, columns and schema, so callers can't alter it.
+        """
+        return [
+            {
+                **entry,
+                "default_params": dict(entry["default_params"]),
+                "required_columns": list(entry["required_columns"]),
+                "output_schema": dict(entry["output_schema"])
+            }
+            for entry in self._listing
         ]
 
 # Global registry instance
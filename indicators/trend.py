@@ -1,9 +1,23 @@
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import math
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from . import _kernels
 from .base import Indicator
 
+class SMAState(NamedTuple):
+    """
+    The last `length` values and their running sum.
+    
+    The window is an immutable tuple, so update() leaves the state it was
+    given untouched and a state can be updated more than once.
+    """
+    window: Tuple[float, ...]
+    total: float
+
 class SMA(Indicator):
+    state_cls = SMAState
+
     @property
     def name(self) -> str:
         return "sma"
@@ -20,7 +34,7 @@ class SMA(Indicator):
     def default_params(self) -> Dict[str, Any]:
         return {"length": 20}
 
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
         p = self.validate_params(params)
         length = p.get("length", p.get("period", 20))
         col = p.get("source", "close")
@@ -28,14 +42,41 @@ class SMA(Indicator):
         if col not in df.columns:
             return {"error": f"Column {col} not found"}
         
-        sma_series = df.ta.sma(close=col, length=length)
-        if sma_series is None or sma_series.empty:
-            return {"value": None}
-            
-        val = sma_series.iloc[-1]
-        return {"value": float(val) if pd.notnull(val) else None}
+        x = self._column(df, col, arrays)
+        val = _kernels.sma_last(x, int(length))
+        return {"value": None if math.isnan(val) else float(val)}
+
+    def initial_state(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> SMAState:
+        p = self.validate_params(params)
+        length = int(p.get("length", p.get("period", 20)))
+        col = p.get("source", "close")
+        
+        window = tuple(self._column(df, col, arrays)[-length:].tolist())
+        return SMAState(window, float(sum(window)))
+
+    def update(self, state: SMAState, bar: Dict[str, float], **params) -> Tuple[SMAState, Dict[str, Any]]:
+        p = self.validate_params(params)
+        length = int(p.get("length", p.get("period", 20)))
+        col = p.get("source", "close")
+        
+        x = float(bar[col])
+        window, total = state
+        if len(window) == length:
+            total -= window[0]
+        window = (window + (x,))[-length:]
+        total += x
+        val = total / length if len(window) == length else math.nan
+        return SMAState(window, total), {"value": None if math.isnan(val) else float(val)}
+
+class EMAState(NamedTuple):
+    """EMA after the last bar seen; until it is seeded, the sum of the values seen so far."""
+    value: float
+    seed_sum: float
+    bars: int
 
 class EMA(Indicator):
+    state_cls = EMAState
+
     @property
     def name(self) -> str:
         return "ema"
@@ -52,7 +93,7 @@ class EMA(Indicator):
     def default_params(self) -> Dict[str, Any]:
         return {"length": 20}
 
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
         p = self.validate_params(params)
         length = p.get("length", p.get("period", 20))
         col = p.get("source", "close")
@@ -60,9 +101,33 @@ class EMA(Indicator):
         if col not in df.columns:
             return {"error": f"Column {col} not found"}
 
-        ema_series = df.ta.ema(close=col, length=length)
-        if ema_series is None or ema_series.empty:
-            return {"value": None}
-            
-        val = ema_series.iloc[-1]
-        return {"value": float(val) if pd.notnull(val) else None}
+        x = self._column(df, col, arrays)
+        val = _kernels.ema_last(x, int(length))
+        return {"value": None if math.isnan(val) else float(val)}
+
+    def initial_state(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> EMAState:
+        p = self.validate_params(params)
+        length = p.get("length", p.get("period", 20))
+        col = p.get("source", "close")
+        
+        x = self._column(df, col, arrays)
+        if x.size >= length:
+            return EMAState(_kernels.ema_last(x, int(length)), math.nan, x.size)
+        # Too short to seed: carry the sum until length values have been seen
+        return EMAState(math.nan, float(x.sum()), x.size)
+
+    def update(self, state: EMAState, bar: Dict[str, float], **params) -> Tuple[EMAState, Dict[str, Any]]:
+        p = self.validate_params(params)
+        length = p.get("length", p.get("period", 20))
+        col = p.get("source", "close")
+        
+        x = float(bar[col])
+        bars = state.bars + 1
+        if state.bars >= length:
+            val = _kernels.ema_update(state.value, x, int(length))
+            return EMAState(val, state.seed_sum, bars), {"value": None if math.isnan(val) else float(val)}
+        
+        # Seeded with the SMA of the first length values, as in ema_last
+        seed_sum = state.seed_sum + x
+        val = seed_sum / length if bars == length else math.nan
+        return EMAState(val, seed_sum, bars), {"value": None if math.isnan(val) else float(val)}
@@ -1,9 +1,23 @@
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import math
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from . import _kernels
 from .base import Indicator
 
+class ATRState(NamedTuple):
+    """
+    ATR after the last bar seen, and that bar's close for the next true range.
+    Until the ATR is seeded, seed_sum holds the sum of the true ranges seen so far.
+    """
+    atr: float
+    prev_close: float
+    seed_sum: float
+    bars: int
+
 class ATR(Indicator):
+    state_cls = ATRState
+
     @property
     def name(self) -> str:
         return "atr"
@@ -24,13 +38,45 @@ class ATR(Indicator):
     def required_columns(self):
         return ["high", "low", "close"]
 
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
+        p = self.validate_params(params)
+        length = p.get("length", p.get("period", 14))
+        
+        high = self._column(df, "high", arrays)
+        low = self._column(df, "low", arrays)
+        close = self._column(df, "close", arrays)
+        val = _kernels.atr_last(high, low, close, int(length))
+        return {"value": None if math.isnan(val) else float(val)}
+
+    def initial_state(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> ATRState:
         p = self.validate_params(params)
         length = p.get("length", p.get("period", 14))
         
-        atr_series = df.ta.atr(length=length)
-        if atr_series is None or atr_series.empty:
-            return {"value": None}
-            
-        val = atr_series.iloc[-1]
-        return {"value": float(val) if pd.notnull(val) else None}
+        high = self._column(df, "high", arrays)
+        low = self._column(df, "low", arrays)
+        close = self._column(df, "close", arrays)
+        prev_close = float(close[-1]) if close.size else math.nan
+        if close.size >= length:
+            return ATRState(_kernels.atr_last(high, low, close, int(length)), prev_close, math.nan, close.size)
+        
+        # Too short to seed: carry the true-range sum, the first bar's being high - low
+        seed_sum = 0.0
+        for i in range(close.size):
+            seed_sum += high[i] - low[i] if i == 0 else _kernels._true_range(high[i], low[i], close[i - 1])
+        return ATRState(math.nan, prev_close, seed_sum, close.size)
+
+    def update(self, state: ATRState, bar: Dict[str, float], **params) -> Tuple[ATRState, Dict[str, Any]]:
+        p = self.validate_params(params)
+        length = p.get("length", p.get("period", 14))
+        
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        bars = state.bars + 1
+        if state.bars >= length:
+            val = _kernels.atr_update(state.atr, high, low, state.prev_close, int(length))
+            return ATRState(val, close, state.seed_sum, bars), {"value": None if math.isnan(val) else float(val)}
+        
+        # Seeded with the mean of the first length true ranges, as in atr_last
+        tr = high - low if state.bars == 0 else _kernels._true_range(high, low, state.prev_close)
+        seed_sum = state.seed_sum + tr
+        val = seed_sum / length if bars == length else math.nan
+        return ATRState(val, close, seed_sum, bars), {"value": None if math.isnan(val) else float(val)}
@@ -1,6 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+import math
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from . import _kernels
 from .base import Indicator
 
 class VolumeSMA(Indicator):
@@ -24,18 +26,15 @@ class VolumeSMA(Indicator):
     def required_columns(self):
         return ["volume"]
 
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
         p = self.validate_params(params)
         length = p.get("length", p.get("period", 20))
         
-        # We can use SMA on volume
-        sma_series = df.ta.sma(close="volume", length=length)
-        if sma_series is None or sma_series.empty:
-            return {"value": None}
-            
-        val = sma_series.iloc[-1]
+        # SMA on volume
+        v = self._column(df, "volume", arrays)
+        val = _kernels.sma_last(v, int(length))
         
-        return {"value": float(val) if pd.notnull(val) else None}
+        return {"value": None if math.isnan(val) else float(val)}
 
 class CVD(Indicator):
     @property
@@ -58,18 +57,21 @@ class CVD(Indicator):
     def required_columns(self):
         return ["open", "close", "volume"]
 
-    def compute(self, df: pd.DataFrame, **params) -> Dict[str, Any]:
+    def compute(self, df: pd.DataFrame, arrays: Optional[Dict[str, np.ndarray]] = None, **params) -> Dict[str, Any]:
         if df.empty:
             return {"value": None}
 
-        # Calculate Delta: Volume if Close >= Open, else -Volume
+        # Delta: Volume if Close >= Open, else -Volume
         # This is the most common OHLCV approximation of Delta.
-        delta = df["volume"].copy()
-        delta.loc[df["close"] < df["open"]] *= -1
-        
-        # Cumulative Sum
-        cvd_series = delta.cumsum()
+        o = self._column(df, "open", arrays)
+        c = self._column(df, "close", arrays)
+        v = self._column(df, "volume", arrays)
         
-        val = cvd_series.iloc[-1]
+        # Only the last cumulative value is reported, which is just the total.
+        # As with a pandas cumsum, NaN volumes are skipped except on the last
+        # bar, and a NaN open/close compares False and counts as buying
+        if math.isnan(v[-1]):
+            return {"value": None}
+        val = float(np.nansum(np.where(c < o, -v, v)))
         
-        return {"value": float(val) if pd.notnull(val) else None}
+        return {"value": val if not math.isnan(val) else None}
@@ -0,0 +1,36 @@
+from typing import Any, Dict, Optional
+import pandas as pd
+
+
+def last_timestamp(df: pd.DataFrame) -> Optional[str]:
+    """Timestamp of the last bar as a string, or None for an empty frame."""
+    if len(df) == 0:
+        return None
+    return str(df["timestamp"].iat[-1])
+
+
+def last_bar_metadata(
+    df: pd.DataFrame,
+    ticker: str,
+    timeframe: int,
+    day: Optional[int],
+    minute: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Cache metadata for the last bar of a non-empty frame.
+    
+    Reads single cells with .iat instead of materializing the whole last
+    row with .iloc, which would box every column into an object Series.
+    """
+    columns = df.columns
+    
+    def last(col: str, default: Any) -> Any:
+        return df[col].iat[-1] if col in columns else default
+    
+    return {
+        'ticker': ticker,
+        'day': int(last('trade_day', day or 0)),
+        'minute': int(last('minute_of_day', minute or 0)),
+        'timeframe': timeframe,
+        'is_final': bool(last('is_final', False))
+    }
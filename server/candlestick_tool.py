@@ -1,5 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from data.bars_client import BarsClient
+from server.bars import last_bar_metadata, last_timestamp
 from candlesticks.compute import detect_patterns
 from candlesticks.registry import pattern_registry
 from cache import global_cache
@@ -35,18 +36,11 @@ def detect_patterns_tool(
     # 1. Fetch Request
     df = client.fetch_bars(ticker, day=day, minute=minute, limit=limit, timeframe=timeframe)
 
-    if df.empty:
+    if len(df) == 0:
         return {"error": "No data found", "ticker": ticker, "patterns": []}
 
     # 2. Extract metadata from last bar for caching
-    last_bar = df.iloc[-1]
-    bar_metadata = {
-        'ticker': ticker,
-        'day': int(last_bar.get('trade_day', day or 0)),
-        'minute': int(last_bar.get('minute_of_day', minute or 0)),
-        'timeframe': timeframe,
-        'is_final': bool(last_bar.get('is_final', False))
-    }
+    bar_metadata = last_bar_metadata(df, ticker, timeframe, day, minute)
 
     # 3. Compute with cache
     patterns = detect_patterns(df, cache=global_cache, bar_metadata=bar_metadata)
@@ -54,6 +48,6 @@ def detect_patterns_tool(
     # 4. Return
     return {
         "ticker": ticker,
-        "last_timestamp": str(df["timestamp"].iloc[-1]) if not df.empty else None,
-        "patterns": patterns
+        "last_timestamp": last_timestamp(df),
+        "patterns": [p.to_dict() for p in patterns]
     }
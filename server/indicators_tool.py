@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Optional
 from data.bars_client import BarsClient
+from server.bars import last_bar_metadata, last_timestamp
 from indicators.compute import compute_indicators
 from indicators.registry import registry
 from cache import global_cache
@@ -38,18 +39,11 @@ def compute_indicators_tool(
     # 1. Fetch Request
     df = client.fetch_bars(ticker, day=day, minute=minute, limit=limit, timeframe=timeframe)
 
-    if df.empty:
+    if len(df) == 0:
         return {"error": "No data found", "ticker": ticker}
 
     # 2. Extract metadata from last bar for caching
-    last_bar = df.iloc[-1]
-    bar_metadata = {
-        'ticker': ticker,
-        'day': int(last_bar.get('trade_day', day or 0)),
-        'minute': int(last_bar.get('minute_of_day', minute or 0)),
-        'timeframe': timeframe,
-        'is_final': bool(last_bar.get('is_final', False))
-    }
+    bar_metadata = last_bar_metadata(df, ticker, timeframe, day, minute)
 
     # 3. Compute with cache
     results = compute_indicators(df, indicators, cache=global_cache, bar_metadata=bar_metadata)
@@ -57,7 +51,7 @@ def compute_indicators_tool(
     # 4. Return
     return {
         "ticker": ticker,
-        "last_timestamp": str(df["timestamp"].iloc[-1]) if not df.empty else None,
+        "last_timestamp": last_timestamp(df),
         "results": results
     }
 
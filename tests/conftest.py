@@ -0,0 +1,15 @@
+import pytest
+import pandas as pd
+from fastapi.testclient import TestClient
+from main import app
+
+@pytest.fixture(scope="session")
+def api_client():
+    # Startup/shutdown and the connection pool are shared by every API test
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="module")
+def sample_bar_df():
+    # Built once per module; tools under test only read it
+    return pd.DataFrame([{"close": 100, "timestamp": "2023-01-01"}])
@@ -1,6 +1,9 @@
+import os
 import pytest
+import numpy as np
 import pandas as pd
-from cache import ResultCache, _make_params_key
+from cache import ResultCache, ClockCache, TinyLFUCache, PersistentResultCache
+from cache.result_cache import _make_params_key
 
 
 class TestResultCache:
@@ -15,8 +18,23 @@ class TestResultCache:
         assert _make_params_key(params1) == _make_params_key(params2)
     
     def test_params_key_empty(self):
-        """Test empty params produce empty frozenset."""
-        assert _make_params_key({}) == frozenset()
+        """Test empty params produce an empty tuple."""
+        assert _make_params_key({}) == ()
+    
+    def test_params_key_tracks_mutation(self):
+        """Test that mutating a params dict in place yields a fresh key."""
+        params = {"length": 14}
+        key14 = _make_params_key(params)
+        
+        params["length"] = 21
+        
+        assert _make_params_key(params) != key14
+        assert _make_params_key(params) == (("length", 21),)
+    
+    def test_params_key_sorted_for_any_size(self):
+        """Test that small and large params both produce key-sorted tuples."""
+        for params in ({"b": 1, "a": 2}, {"a": 2, "b": 1}, {"d": 1, "c": 2, "b": 3, "a": 4}):
+            assert _make_params_key(params) == tuple(sorted(params.items()))
     
     def test_indicator_cache_hit(self):
         """Test cache hit for indicators."""
@@ -91,6 +109,58 @@ class TestResultCache:
         assert result14 == {"rsi": 65.5}
         assert result21 == {"rsi": 62.3}
     
+    def test_indicator_bulk_round_trip(self):
+        """Test bulk get/set against the single-entry API."""
+        cache = ResultCache()
+        rsi_key = cache.params_key({"length": 14})
+        
+        assert cache.params_key({"levels": [30, 70]}) is None
+        
+        cache.set_indicators_bulk("BTCUSDT", 20241228, 930, 1, [
+            ("rsi", rsi_key, {"value": 65.5}),
+            ("sma", cache.params_key({"length": 20}), {"value": 101.0}),
+            ("bad", None, {"value": 1.0})
+        ])
+        
+        assert cache.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}) == {"value": 65.5}
+        assert cache.get_indicators_bulk("BTCUSDT", 20241228, 930, 1, {
+            "rsi": rsi_key,
+            "sma": cache.params_key({"length": 50}),
+            "ema": cache.params_key({"length": 20}),
+            "bad": None
+        }) == {"rsi": {"value": 65.5}, "sma": None, "ema": None, "bad": None}
+    
+    def test_indicator_slot_shares_entries(self):
+        """Test that slot-based access sees the same entries as the kw-arg API."""
+        cache = ResultCache()
+        slot = cache.make_slot_key("BTCUSDT", 20241228, 930, 1, "rsi")
+        
+        assert cache.get_indicator_by_slot(slot, cache.params_key({"length": 14})) is None
+        
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": 65.5})
+        cache.set_indicator_by_slot(slot, cache.params_key({"length": 21}), {"value": 61.0})
+        
+        assert cache.get_indicator_by_slot(slot, cache.params_key({"length": 14})) == {"value": 65.5}
+        assert cache.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 21}) == {"value": 61.0}
+    
+    def test_indicator_keyer_shares_entries(self):
+        """Test that keyer-based access sees the same entries as the kw-arg API."""
+        cache = ResultCache()
+        keyer = cache.make_indicator_keyer("BTCUSDT", 1, "rsi", {"length": 14})
+        
+        cache.set_indicator(
+            ticker="BTCUSDT", day=20241228, minute=930, timeframe=1,
+            indicator_name="rsi", params={"length": 14}, value={"rsi": 65.5}
+        )
+        cache.set_indicator_fast(keyer, 20241228, 931, {"rsi": 66.0})
+        
+        assert cache.get_indicator_fast(keyer, 20241228, 930) == {"rsi": 65.5}
+        assert cache.get_indicator(
+            ticker="BTCUSDT", day=20241228, minute=931, timeframe=1,
+            indicator_name="rsi", params={"length": 14}
+        ) == {"rsi": 66.0}
+        assert cache.get_indicator_fast(keyer, 20241228, 932) is None
+    
     def test_pattern_cache_hit(self):
         """Test cache hit for patterns."""
         cache = ResultCache()
@@ -117,6 +187,45 @@ class TestResultCache:
         
         assert result == patterns
     
+    def test_pattern_cache_by_key(self):
+        """Test that tuple-key access shares entries with the keyword API."""
+        cache = ResultCache()
+        key = ("BTCUSDT", 20241228, 930, 1)
+        patterns = [{"name": "hammer", "classification": "bullish", "confidence": 0.8}]
+        
+        cache.set_patterns_by_key(key, patterns)
+        
+        assert cache.get_patterns_by_key(key) is patterns
+        assert cache.get_patterns("BTCUSDT", 20241228, 930, 1) is patterns
+        assert cache.get_patterns_by_key(("BTCUSDT", 20241228, 931, 1)) is None
+    
+    def test_empty_patterns_kept_apart(self):
+        """Test that pattern-free bars are remembered without using pattern-cache slots."""
+        cache = ResultCache(max_size_empty_patterns=2, num_shards=1)
+        
+        for minute in (930, 931, 932):
+            cache.set_patterns_by_key(("BTCUSDT", 20241228, minute, 1), [])
+        
+        assert cache.get_patterns_by_key(("BTCUSDT", 20241228, 930, 1)) is None  # FIFO-evicted
+        assert cache.get_patterns_by_key(("BTCUSDT", 20241228, 932, 1)) == []
+        stats = cache.get_stats()
+        assert stats["pattern_cache"]["size"] == 0
+        assert stats["empty_pattern_cache"] == {"size": 2, "maxsize": 2}
+    
+    def test_pattern_rewrite_replaces_empty(self):
+        """Test that the latest store for a bar wins whether or not it had hits."""
+        cache = ResultCache()
+        key = ("BTCUSDT", 20241228, 930, 1)
+        patterns = [{"name": "hammer", "confidence": 0.8}]
+        
+        cache.set_patterns_by_key(key, [])
+        cache.set_patterns_by_key(key, patterns)
+        assert cache.get_patterns_by_key(key) is patterns
+        
+        cache.set_patterns_by_key(key, [])
+        assert cache.get_patterns_by_key(key) == []
+        assert cache.get_stats()["pattern_cache"]["size"] == 0
+    
     def test_pattern_cache_miss(self):
         """Test cache miss for patterns."""
         cache = ResultCache()
@@ -160,7 +269,8 @@ class TestResultCache:
     
     def test_lru_eviction(self):
         """Test that LRU eviction works."""
-        cache = ResultCache(max_size_per_indicator=2)
+        # One shard, so the whole capacity of 2 is available to this series
+        cache = ResultCache(max_size_per_indicator=2, num_shards=1)
         
         # Add 3 entries (should evict the first)
         cache.set_indicator(
@@ -198,6 +308,57 @@ class TestResultCache:
         )
         assert result932 == {"rsi": 66.5}
     
+    def test_clock_cache_hit_gets_second_chance(self):
+        """Test that a hit protects an entry from the next eviction."""
+        clock = ClockCache(maxsize=2)
+        clock["a"] = 1
+        clock["b"] = 2
+        
+        assert clock.get("a") == 1
+        clock["c"] = 3
+        
+        assert "a" in clock
+        assert "b" not in clock
+        assert len(clock) == 2
+    
+    def test_clock_cache_all_referenced(self):
+        """Test that eviction still makes progress when every entry was hit."""
+        clock = ClockCache(maxsize=1)
+        clock["a"] = 1
+        clock.get("a")
+        clock["b"] = 2
+        
+        assert "a" not in clock
+        assert clock.get("b") == 2
+        
+        clock = ClockCache(maxsize=3)
+        for key in "abc":
+            clock[key] = key
+            clock.get(key)
+        clock["d"] = "d"
+        clock["e"] = "e"
+        
+        # Every bit was cleared by the first pass, so eviction resumes in FIFO order
+        assert [key for key in "abcde" if key in clock] == ["c", "d", "e"]
+        
+        clock.clear()
+        assert len(clock) == 0
+        clock["f"] = "f"
+        assert clock.get("f") == "f"
+    
+    def test_clock_cache_pop(self):
+        """Test that popping unlinks the entry so later evictions skip it."""
+        clock = ClockCache(maxsize=2)
+        clock["a"] = 1
+        clock["b"] = 2
+        
+        assert clock.pop("a") == 1
+        assert clock.pop("a") is None
+        clock["c"] = 3
+        clock["d"] = 4
+        
+        assert [key for key in "abcd" if key in clock] == ["c", "d"]
+    
     def test_get_stats(self):
         """Test cache statistics."""
         cache = ResultCache()
@@ -218,3 +379,208 @@ class TestResultCache:
         assert "rsi" in stats["indicator_caches"]
         assert stats["indicator_caches"]["rsi"]["size"] == 1
         assert stats["pattern_cache"]["size"] == 1
+    
+    def test_capacities_split_across_shards(self):
+        """Test that configured capacities are totals, not per-shard sizes."""
+        cache = ResultCache(max_size_per_indicator=1000, max_size_patterns=2000,
+                            max_size_empty_patterns=4096, num_shards=64)
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": 65.5})
+        stats = cache.get_stats()
+        
+        # Per-shard shares are rounded up, so the totals overshoot by under one entry per shard
+        assert 1000 <= stats["indicator_caches"]["rsi"]["maxsize"] < 1000 + 64
+        assert 2000 <= stats["pattern_cache"]["maxsize"] < 2000 + 64
+        assert 4096 <= stats["empty_pattern_cache"]["maxsize"] < 4096 + 64
+        
+        # Every shard keeps at least one entry
+        tiny = ResultCache(max_size_patterns=2, num_shards=64)
+        assert tiny.get_stats()["pattern_cache"]["maxsize"] == 64
+    
+    def test_one_ticker_day_fills_capacity(self):
+        """Test that a single ticker-day spreads over the shards and can use the whole budget."""
+        cache = ResultCache(max_size_per_indicator=256, max_size_patterns=256, num_shards=64)
+        for minute in range(256):
+            cache.set_indicator("BTCUSDT", 20241228, minute, 1, "rsi", {"length": 14}, {"value": float(minute)})
+            cache.set_patterns("BTCUSDT", 20241228, minute, 1, [{"name": "hammer"}])
+        
+        stats = cache.get_stats()
+        assert stats["indicator_caches"]["rsi"]["size"] == 256
+        assert stats["pattern_cache"]["size"] == 256
+        assert cache.get_indicator("BTCUSDT", 20241228, 0, 1, "rsi", {"length": 14}) == {"value": 0.0}
+        
+        # A full session with the default budgets is kept whole
+        cache = ResultCache()
+        for minute in range(570, 960):
+            cache.set_indicator("BTCUSDT", 20241228, minute, 1, "rsi", {"length": 14}, {"value": 1.0})
+            cache.set_patterns("BTCUSDT", 20241228, minute, 1, [{"name": "hammer"}])
+        
+        stats = cache.get_stats()
+        assert stats["indicator_caches"]["rsi"]["size"] == 390
+        assert stats["pattern_cache"]["size"] == 390
+    
+    def test_sharded_entries_are_isolated(self):
+        """Test that entries for different tickers are kept apart across shards."""
+        cache = ResultCache(num_shards=4)
+        
+        for ticker, value in (("BTCUSDT", 65.5), ("ETHUSDT", 40.0), ("SPY", 55.0)):
+            cache.set_indicator(
+                ticker=ticker, day=20241228, minute=930, timeframe=1,
+                indicator_name="rsi", params={"length": 14}, value={"rsi": value}
+            )
+        
+        assert cache.get_indicator(
+            ticker="ETHUSDT", day=20241228, minute=930, timeframe=1,
+            indicator_name="rsi", params={"length": 14}
+        ) == {"rsi": 40.0}
+        assert cache.get_stats()["indicator_caches"]["rsi"]["size"] == 3
+    
+    def test_num_shards_must_be_power_of_two(self):
+        """Test that a non power-of-two shard count is rejected."""
+        with pytest.raises(ValueError):
+            ResultCache(num_shards=3)
+
+
+class TestTinyLFUCache:
+    """Test the W-TinyLFU cache policy."""
+    
+    def test_frequent_entries_survive_scan(self):
+        """Test that a one-off scan does not flush frequently hit entries."""
+        tinylfu = TinyLFUCache(maxsize=100)
+        clock = ClockCache(maxsize=100)
+        for cache in (tinylfu, clock):
+            for key in range(50):
+                cache[key] = key
+            for _ in range(5):
+                for key in range(50):
+                    cache.get(key)
+            for key in range(1000, 3000):
+                cache[key] = key
+        
+        assert len(tinylfu) == 100
+        assert sum(key in tinylfu for key in range(50)) >= 45
+        assert sum(key in clock for key in range(50)) < 45
+    
+    def test_tiny_capacity(self):
+        """Test that capacities too small for a main region still bound the cache."""
+        cache = TinyLFUCache(maxsize=1)
+        cache["a"] = 1
+        cache["b"] = 2
+        
+        assert len(cache) == 1
+        assert cache.get("b") == 2
+        
+        cache.clear()
+        assert len(cache) == 0
+    
+    def test_result_cache_policy(self):
+        """Test that ResultCache can use TinyLFU for indicator caches."""
+        cache = ResultCache(policy="tinylfu")
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": 65.5})
+        
+        assert cache.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}) == {"value": 65.5}
+        assert cache.get_stats()["indicator_caches"]["rsi"]["size"] == 1
+        
+        with pytest.raises(ValueError, match="Unknown cache policy"):
+            ResultCache(policy="lru")
+
+
+class TestPersistentResultCache:
+    """Test the file-backed indicator cache."""
+    
+    def test_results_survive_reopen(self, tmp_path):
+        """Test that a new instance on the same file serves previously stored results."""
+        path = str(tmp_path / "indicators.cache")
+        cache = PersistentResultCache(path)
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": 65.5})
+        cache.set_indicators_bulk("BTCUSDT", 20241228, 931, 1, [
+            ("sma", cache.params_key({"length": 20}), {"value": None}),
+            ("macd", cache.params_key({}), {"macd": 1.0, "signal": 0.5})
+        ])
+        cache.close()
+        
+        reopened = PersistentResultCache(path)
+        assert reopened.get_stats()["persistent"]["records"] == 2
+        assert reopened.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}) == {"value": 65.5}
+        assert reopened.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 7}) is None
+        
+        bulk = reopened.get_indicators_bulk("BTCUSDT", 20241228, 931, 1, {
+            "sma": reopened.params_key({"length": 20}),
+            "macd": reopened.params_key({})
+        })
+        # Multi-value results are kept in memory only
+        assert bulk == {"sma": {"value": None}, "macd": None}
+        
+        keyer = reopened.make_indicator_keyer("BTCUSDT", 1, "rsi", {"length": 14})
+        assert reopened.get_indicator_fast(keyer, 20241228, 930) == {"value": 65.5}
+        reopened.close()
+    
+    def test_file_grows_and_clears(self, tmp_path):
+        """Test that appends past the initial capacity remap the file, and clear() empties it."""
+        path = str(tmp_path / "indicators.cache")
+        cache = PersistentResultCache(path, max_size_per_indicator=10)
+        initial_size = os.path.getsize(path)
+        keyer = cache.make_indicator_keyer("BTCUSDT", 1, "rsi", {"length": 14})
+        for minute in range(5000):
+            cache.set_indicator_fast(keyer, 20241228, minute, {"value": float(minute)})
+        
+        assert cache.get_indicator_fast(keyer, 20241228, 0) == {"value": 0.0}
+        assert cache.get_indicator_fast(keyer, 20241228, 4999) == {"value": 4999.0}
+        assert os.path.getsize(path) > initial_size
+        
+        cache.clear()
+        cache.close()
+        cache.close()
+        assert os.path.getsize(path) == initial_size
+        assert PersistentResultCache(path).get_stats()["persistent"]["records"] == 0
+    
+    def test_numpy_scalars_persisted(self, tmp_path):
+        """Test that numpy scalar results are written through, and bools are not."""
+        path = str(tmp_path / "indicators.cache")
+        cache = PersistentResultCache(path)
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": np.float64(65.5)})
+        cache.set_indicator("BTCUSDT", 20241228, 931, 1, "rsi", {"length": 14}, {"value": np.int64(3)})
+        cache.set_indicator("BTCUSDT", 20241228, 932, 1, "rsi", {"length": 14}, {"value": True})
+        assert cache.get_stats()["persistent"]["records"] == 2
+        cache.close()
+        
+        reopened = PersistentResultCache(path)
+        assert reopened.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}) == {"value": 65.5}
+        assert reopened.get_indicator("BTCUSDT", 20241228, 931, 1, "rsi", {"length": 14}) == {"value": 3.0}
+        assert reopened.get_indicator("BTCUSDT", 20241228, 932, 1, "rsi", {"length": 14}) is None
+        reopened.close()
+    
+    def test_corrupt_count_resets_file(self, tmp_path):
+        """Test that a header count past the end of the file empties the cache instead of failing."""
+        path = tmp_path / "indicators.cache"
+        cache = PersistentResultCache(str(path))
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": 65.5})
+        cache.close()
+        
+        data = bytearray(path.read_bytes())
+        data[8:16] = (10 ** 9).to_bytes(8, "little")
+        path.write_bytes(bytes(data))
+        
+        reopened = PersistentResultCache(str(path))
+        assert reopened.get_stats()["persistent"]["records"] == 0
+        assert reopened.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}) is None
+        reopened.close()
+    
+    def test_usable_after_close(self, tmp_path):
+        """Test that a closed cache keeps serving from memory without touching the file."""
+        cache = PersistentResultCache(str(tmp_path / "indicators.cache"), max_size_per_indicator=64)
+        cache.set_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}, {"value": 65.5})
+        cache.close()
+        
+        assert cache.get_indicator("BTCUSDT", 20241228, 930, 1, "rsi", {"length": 14}) == {"value": 65.5}
+        assert cache.get_indicator("BTCUSDT", 20241228, 931, 1, "rsi", {"length": 14}) is None
+        cache.set_indicator("BTCUSDT", 20241228, 931, 1, "rsi", {"length": 14}, {"value": 1.0})
+        assert cache.get_indicator("BTCUSDT", 20241228, 931, 1, "rsi", {"length": 14}) == {"value": 1.0}
+        cache.clear()
+    
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that a file without the cache header is not overwritten."""
+        path = tmp_path / "not_a_cache"
+        path.write_bytes(b"x" * 64)
+        
+        with pytest.raises(ValueError, match="not an indicator cache file"):
+            PersistentResultCache(str(path))
@@ -31,3 +31,104 @@ def test_client_fetch_bars_backwards(respx_mock):
     # Check that query params were passed if possible (respx helps here)
     assert respx_mock.calls[0].request.url.params["day"] == "20230101"
     assert respx_mock.calls[0].request.url.params["minute"] == "1000"
+
+def test_client_reuses_connection_pool(respx_mock):
+    respx_mock.get("http://testserver/bars/AAPL").mock(return_value=httpx.Response(200, json=[]))
+    
+    with BarsClient(base_url="http://testserver") as client:
+        pool = client._client
+        client.fetch_latest_bars("AAPL")
+        client.fetch_latest_bars("AAPL")
+        assert client._client is pool
+        assert len(respx_mock.calls) == 2
+    
+    assert pool.is_closed
+
+def test_client_parses_columns(respx_mock):
+    mock_data = [
+        {"timestamp": 1, "open": 100, "high": 105, "low": 95, "close": 102, "volume": 1000, "is_final": True},
+        {"timestamp": 2, "open": 102, "high": 106, "low": 101, "close": 104.5, "volume": 800, "is_final": False}
+    ]
+    respx_mock.get("http://testserver/bars/AAPL").mock(return_value=httpx.Response(200, json=mock_data))
+    
+    df = BarsClient(base_url="http://testserver").fetch_latest_bars("AAPL")
+    
+    assert list(df.columns) == BarsClient.REQUIRED_COLUMNS + ["is_final"]
+    assert df["close"].dtype == "float64"
+    assert df["close"].tolist() == [102.0, 104.5]
+    assert df["timestamp"].tolist() == [1, 2]
+    assert df["is_final"].tolist() == [True, False]
+
+def test_client_missing_columns(respx_mock):
+    mock_data = [{"timestamp": 1, "open": 100, "high": 105, "low": 95, "close": 102}]
+    respx_mock.get("http://testserver/bars/AAPL").mock(return_value=httpx.Response(200, json=mock_data))
+    
+    with pytest.raises(ValueError, match="missing required columns"):
+        BarsClient(base_url="http://testserver").fetch_latest_bars("AAPL")
+
+def test_client_column_payload(respx_mock):
+    mock_data = {
+        "timestamp": [1, 2],
+        "open": [100, 102],
+        "high": [105, 106],
+        "low": [95, 101],
+        "close": [102, 104.5],
+        "volume": [1000, 800]
+    }
+    respx_mock.get("http://testserver/bars/AAPL").mock(return_value=httpx.Response(200, json=mock_data))
+    client = BarsClient(base_url="http://testserver")
+    
+    df = client.fetch_latest_bars("AAPL")
+    arrays = client.fetch_arrays("AAPL")
+    
+    assert list(df.columns) == BarsClient.REQUIRED_COLUMNS
+    assert df["close"].tolist() == [102.0, 104.5]
+    assert arrays["close"].dtype == "float64"
+    assert arrays["close"].tolist() == [102.0, 104.5]
+    assert arrays["timestamp"].tolist() == [1, 2]
+
+def test_client_null_values_become_nan(respx_mock):
+    rows = [
+        {"timestamp": 1, "open": 100, "high": 105, "low": 95, "close": 102, "volume": 1000},
+        {"timestamp": 2, "open": 102, "high": 106, "low": 101, "close": 104.5, "volume": None}
+    ]
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+    client = BarsClient(base_url="http://testserver")
+    
+    for payload in (rows, columns):
+        respx_mock.get("http://testserver/bars/AAPL").mock(return_value=httpx.Response(200, json=payload))
+        df = client.fetch_latest_bars("AAPL")
+        
+        assert df["volume"].dtype == "float64"
+        assert df["volume"].isna().tolist() == [False, True]
+        assert df["close"].tolist() == [102.0, 104.5]
+        assert df["timestamp"].tolist() == [1, 2]
+
+def test_client_fetches_do_not_share_buffers(respx_mock):
+    mock_data = [
+        {"timestamp": 1, "open": 100, "high": 105, "low": 95, "close": 102, "volume": 1000}
+    ]
+    respx_mock.get("http://testserver/bars/AAPL").mock(return_value=httpx.Response(200, json=mock_data))
+    client = BarsClient(base_url="http://testserver")
+    
+    first = client.fetch_arrays("AAPL")
+    second = client.fetch_arrays("AAPL")
+    first["close"][0] = 0.0
+    
+    assert first["close"].flags.c_contiguous
+    assert second["close"][0] == 102.0
+
+def test_client_fetch_bars_many(respx_mock):
+    for ticker, close in (("AAPL", 102), ("MSFT", 310)):
+        mock_data = [
+            {"timestamp": 1, "open": close, "high": close, "low": close, "close": close, "volume": 10}
+        ]
+        respx_mock.get(f"http://testserver/bars/{ticker}").mock(return_value=httpx.Response(200, json=mock_data))
+    
+    frames = BarsClient(base_url="http://testserver").fetch_bars_many(["AAPL", "MSFT", "AAPL"], limit=1)
+    
+    assert list(frames) == ["AAPL", "MSFT"]
+    assert frames["AAPL"]["close"].tolist() == [102.0]
+    assert frames["MSFT"]["close"].tolist() == [310.0]
+    assert len(respx_mock.calls) == 2
+    assert respx_mock.calls[0].request.url.params["limit"] == "1"
@@ -11,171 +11,115 @@ from candlesticks.bearish import (
     HangingMan, BearishMarubozu, TweezerTop
 )
 
-class TestExtendedPatterns:
-    """Test the extended set of candlestick patterns."""
-    
+def _bars(open_, high, low, close):
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close})
+
+# (pattern class, bars completing the pattern, expected name, classification),
+# built once at import and shared by the parametrized test
+CASES = [
     # --- Bullish Patterns ---
     
-    def test_three_white_soldiers(self):
-        """Test Three White Soldiers pattern."""
-        # 4th bar: bearish (showing weakness before reversal)
-        # Then 3 consecutive bullish candles
-        data = pd.DataFrame({
-            'open': [105.0, 100.0, 102.0, 104.0],
-            'high': [106.0, 102.5, 104.5, 106.5],
-            'low': [99.0, 99.5, 101.5, 103.5],
-            'close': [100.0, 102.0, 104.0, 106.0]  # 1st bearish, next 3 bullish
-        })
-        pattern = ThreeWhiteSoldiers()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'three_white_soldiers'
-        assert result['classification'] == 'bullish'
-
-    def test_bullish_harami(self):
-        """Test Bullish Harami pattern."""
-        data = pd.DataFrame({
-            'open': [110.0, 104.0],
-            'high': [110.5, 106.0],
-            'low': [100.0, 103.0],
-            'close': [100.0, 105.0] # Second candle within first
-        })
-        pattern = BullishHarami()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'bullish_harami'
-
-    def test_piercing_line(self):
-        """Test Piercing Line pattern."""
-        data = pd.DataFrame({
-            'open': [110.0, 100.0], # Second opens gap down
-            'high': [110.5, 106.0],
-            'low': [100.0, 99.0],
-            'close': [102.0, 107.0] # Second closes > 50% into first (midpoint 106)
-        })
-        pattern = PiercingLine()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'piercing_line'
-
-    def test_inverted_hammer(self):
-        """Test Inverted Hammer pattern."""
-        data = pd.DataFrame({
-            'open': [100.0],
-            'high': [105.0], # Long upper shadow
-            'low': [99.5],
-            'close': [101.0] # Small body
-        })
-        pattern = InvertedHammer()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'inverted_hammer'
-
-    def test_bullish_marubozu(self):
-        """Test Bullish Marubozu pattern."""
-        data = pd.DataFrame({
-            'open': [100.0],
-            'high': [110.0],
-            'low': [100.0],
-            'close': [110.0] # Open=Low, Close=High
-        })
-        pattern = BullishMarubozu()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'bullish_marubozu'
-
-    def test_tweezer_bottom(self):
-        """Test Tweezer Bottom pattern."""
-        data = pd.DataFrame({
-            'open': [105.0, 104.0],
-            'high': [106.0, 105.0],
-            'low': [100.0, 100.0], # Matching lows
-            'close': [101.0, 103.0]
-        })
-        pattern = TweezerBottom()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'tweezer_bottom'
-
+    # 4th bar: bearish (showing weakness before reversal)
+    # Then 3 consecutive bullish candles
+    pytest.param(ThreeWhiteSoldiers, _bars(
+        [105.0, 100.0, 102.0, 104.0],
+        [106.0, 102.5, 104.5, 106.5],
+        [99.0, 99.5, 101.5, 103.5],
+        [100.0, 102.0, 104.0, 106.0]  # 1st bearish, next 3 bullish
+    ), 'three_white_soldiers', 'bullish', id='three_white_soldiers'),
+    pytest.param(BullishHarami, _bars(
+        [110.0, 104.0],
+        [110.5, 106.0],
+        [100.0, 103.0],
+        [100.0, 105.0]  # Second candle within first
+    ), 'bullish_harami', 'bullish', id='bullish_harami'),
+    pytest.param(PiercingLine, _bars(
+        [110.0, 100.0],  # Second opens gap down
+        [110.5, 106.0],
+        [100.0, 99.0],
+        [102.0, 107.0]  # Second closes > 50% into first (midpoint 106)
+    ), 'piercing_line', 'bullish', id='piercing_line'),
+    pytest.param(InvertedHammer, _bars(
+        [100.0],
+        [105.0],  # Long upper shadow
+        [99.5],
+        [101.0]  # Small body
+    ), 'inverted_hammer', 'bullish', id='inverted_hammer'),
+    pytest.param(BullishMarubozu, _bars(
+        [100.0],
+        [110.0],
+        [100.0],
+        [110.0]  # Open=Low, Close=High
+    ), 'bullish_marubozu', 'bullish', id='bullish_marubozu'),
+    pytest.param(TweezerBottom, _bars(
+        [105.0, 104.0],
+        [106.0, 105.0],
+        [100.0, 100.0],  # Matching lows
+        [101.0, 103.0]
+    ), 'tweezer_bottom', 'bullish', id='tweezer_bottom'),
+    
     # --- Bearish Patterns ---
     
-    def test_three_black_crows(self):
-        """Test Three Black Crows pattern."""
-        # 4th bar: bullish (showing strength before reversal)
-        # Then 3 consecutive bearish candles
-        data = pd.DataFrame({
-            'open': [100.0, 106.0, 104.0, 102.0],
-            'high': [106.0, 106.5, 104.5, 102.5],
-            'low': [99.0, 103.5, 101.5, 99.5],
-            'close': [106.0, 104.0, 102.0, 100.0]  # 1st bullish, next 3 bearish
-        })
-        pattern = ThreeBlackCrows()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'three_black_crows'
-        assert result['classification'] == 'bearish'
-
-    def test_bearish_harami(self):
-        """Test Bearish Harami pattern."""
-        data = pd.DataFrame({
-            'open': [100.0, 106.0],
-            'high': [110.0, 107.0],
-            'low': [99.0, 104.0],
-            'close': [110.0, 105.0] # Second candle within first
-        })
-        pattern = BearishHarami()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'bearish_harami'
-
-    def test_dark_cloud_cover(self):
-        """Test Dark Cloud Cover pattern."""
-        data = pd.DataFrame({
-            'open': [100.0, 110.0], # Second opens gap up
-            'high': [108.0, 111.0],
-            'low': [99.0, 103.0],
-            'close': [108.0, 103.0] # Second closes < 50% into first (midpoint 104)
-        })
-        pattern = DarkCloudCover()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'dark_cloud_cover'
-
-    def test_hanging_man(self):
-        """Test Hanging Man pattern."""
-        data = pd.DataFrame({
-            'open': [105.2],
-            'high': [105.5],
-            'low': [100.0], # Long lower shadow
-            'close': [105.0] # Small body at top
-        })
-        pattern = HangingMan()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'hanging_man'
+    # 4th bar: bullish (showing strength before reversal)
+    # Then 3 consecutive bearish candles
+    pytest.param(ThreeBlackCrows, _bars(
+        [100.0, 106.0, 104.0, 102.0],
+        [106.0, 106.5, 104.5, 102.5],
+        [99.0, 103.5, 101.5, 99.5],
+        [106.0, 104.0, 102.0, 100.0]  # 1st bullish, next 3 bearish
+    ), 'three_black_crows', 'bearish', id='three_black_crows'),
+    pytest.param(BearishHarami, _bars(
+        [100.0, 106.0],
+        [110.0, 107.0],
+        [99.0, 104.0],
+        [110.0, 105.0]  # Second candle within first
+    ), 'bearish_harami', 'bearish', id='bearish_harami'),
+    pytest.param(DarkCloudCover, _bars(
+        [100.0, 110.0],  # Second opens gap up
+        [108.0, 111.0],
+        [99.0, 103.0],
+        [108.0, 103.0]  # Second closes < 50% into first (midpoint 104)
+    ), 'dark_cloud_cover', 'bearish', id='dark_cloud_cover'),
+    pytest.param(HangingMan, _bars(
+        [105.2],
+        [105.5],
+        [100.0],  # Long lower shadow
+        [105.0]  # Small body at top
+    ), 'hanging_man', 'bearish', id='hanging_man'),
+    pytest.param(BearishMarubozu, _bars(
+        [110.0],
+        [110.0],
+        [100.0],
+        [100.0]  # Open=High, Close=Low
+    ), 'bearish_marubozu', 'bearish', id='bearish_marubozu'),
+    pytest.param(TweezerTop, _bars(
+        [100.0, 102.0],
+        [105.0, 105.0],  # Matching highs
+        [99.0, 100.0],
+        [104.0, 103.0]
+    ), 'tweezer_top', 'bearish', id='tweezer_top'),
+]
 
-    def test_bearish_marubozu(self):
-        """Test Bearish Marubozu pattern."""
-        data = pd.DataFrame({
-            'open': [110.0],
-            'high': [110.0],
-            'low': [100.0],
-            'close': [100.0] # Open=High, Close=Low
-        })
-        pattern = BearishMarubozu()
+class TestExtendedPatterns:
+    """Test the extended set of candlestick patterns."""
+    
+    @pytest.mark.parametrize("cls, data, name, classification", CASES)
+    def test_pattern_detected(self, cls, data, name, classification):
+        """Test that each pattern is detected on bars completing it."""
+        pattern = cls()
         result = pattern.detect(data)
         assert result is not None
-        assert result['name'] == 'bearish_marubozu'
-
-    def test_tweezer_top(self):
-        """Test Tweezer Top pattern."""
+        assert result.name == name
+        assert result.classification == classification
+    
+    def test_tweezer_bottom_zero_low(self):
+        """Test that a zero low is handled without dividing by it."""
         data = pd.DataFrame({
-            'open': [100.0, 102.0],
-            'high': [105.0, 105.0], # Matching highs
-            'low': [99.0, 100.0], 
-            'close': [104.0, 103.0]
+            'open': [1.0, 1.0],
+            'high': [2.0, 2.0],
+            'low': [0.0, 0.0],
+            'close': [0.5, 1.5]
         })
-        pattern = TweezerTop()
-        result = pattern.detect(data)
-        assert result is not None
-        assert result['name'] == 'tweezer_top'
+        pattern = TweezerBottom()
+        assert pattern.detect(data) is not None
+        assert pattern.detect_series(data).tolist() == [False, True]
@@ -1,15 +1,17 @@
 import pytest
 import pandas as pd
 import numpy as np
+import pandas_ta as ta
 from indicators.momentum import RSI
 from indicators.trend import SMA, EMA
 from indicators.volatility import ATR
 from indicators.volume import VolumeSMA, CVD
 from indicators.compute import compute_indicators
+from cache import ResultCache
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_df():
-    # Generate 100 bars of synthetic data
+    # Generate 100 bars of synthetic data, once per module; no test mutates it
     dates = pd.date_range(start="2023-01-01", periods=100, freq="1min")
     df = pd.DataFrame({
         "timestamp": dates,
@@ -17,7 +19,7 @@ def sample_df():
         "high": np.linspace(101, 111, 100),
         "low": np.linspace(99, 109, 100),
         "close": np.linspace(100, 110, 100) + np.sin(np.linspace(0, 10, 100)), # Add some wave
-        "volume": np.random.randint(100, 1000, 100).astype(float)
+        "volume": np.random.default_rng(0).integers(100, 1000, 100).astype(np.float64)
     })
     return df
 
@@ -28,36 +30,120 @@ def test_rsi(sample_df):
     assert isinstance(res["value"], float)
     assert 0 <= res["value"] <= 100
 
+@pytest.mark.parametrize("bars", [15, 20, 30, 100])
+def test_rsi_matches_pandas_ta(sample_df, bars):
+    # Short windows are where the seeding of the Wilder average shows
+    df = sample_df.head(bars)
+    expected = ta.rsi(df["close"], length=14).iloc[-1]
+    res = RSI().compute(df, length=14)
+    assert res["value"] == pytest.approx(expected)
+
 def test_sma(sample_df):
     sma = SMA()
     res = sma.compute(sample_df, period=10)
     assert "value" in res
     assert isinstance(res["value"], float)
 
+def test_sma_matches_pandas_ta(sample_df):
+    expected = ta.sma(sample_df["close"], length=10).iloc[-1]
+    res = SMA().compute(sample_df, length=10)
+    assert res["value"] == pytest.approx(expected)
+    assert SMA().compute(sample_df.head(5), length=10)["value"] is None
+
 def test_ema(sample_df):
     ema = EMA()
     res = ema.compute(sample_df, period=10)
     assert "value" in res
     assert isinstance(res["value"], float)
 
+def test_ema_matches_pandas_ta(sample_df):
+    expected = ta.ema(sample_df["close"], length=10).iloc[-1]
+    res = EMA().compute(sample_df, length=10)
+    assert res["value"] == pytest.approx(expected)
+
 def test_atr(sample_df):
     atr = ATR()
     res = atr.compute(sample_df, period=14)
     assert "value" in res
     assert isinstance(res["value"], float)
 
+def test_atr_matches_pandas_ta(sample_df):
+    expected = ta.atr(sample_df["high"], sample_df["low"], sample_df["close"], length=14).iloc[-1]
+    res = ATR().compute(sample_df, length=14)
+    assert res["value"] == pytest.approx(expected)
+
+def test_atr_uses_previous_close_gaps():
+    df = pd.DataFrame({
+        "high": [11.0, 12.0, 21.0],
+        "low": [9.0, 10.0, 20.0],
+        "close": [10.0, 11.0, 20.5]
+    })
+    # True ranges 2, 2, then 21 - 11 = 10 across the gap; seed (2 + 2) / 2, then RMA
+    res = ATR().compute(df, length=2)
+    assert res["value"] == pytest.approx(0.5 * 10.0 + 0.5 * 2.0)
+    assert ATR().compute(df.head(1), length=2)["value"] is None
+
+@pytest.mark.parametrize("indicator", [RSI(), SMA(), EMA(), ATR()], ids=lambda ind: ind.name)
+@pytest.mark.parametrize("history", [80, 5, 0])
+def test_incremental_update_matches_compute(sample_df, indicator, history):
+    # Histories shorter than length must warm up, not stay None forever
+    state = indicator.initial_state(sample_df.iloc[:history], length=10)
+    assert isinstance(state, indicator.state_cls)
+    for i in range(history, len(sample_df)):
+        bar = sample_df.iloc[i].to_dict()
+        state, res = indicator.update(state, bar, length=10)
+        expected = indicator.compute(sample_df.iloc[:i + 1], length=10)["value"]
+        assert res["value"] == pytest.approx(expected)
+    assert res["value"] is not None
+
+@pytest.mark.parametrize("indicator", [RSI(), SMA(), EMA(), ATR()], ids=lambda ind: ind.name)
+def test_incremental_update_leaves_state_untouched(sample_df, indicator):
+    state = indicator.initial_state(sample_df.iloc[:-1], length=10)
+    bar = sample_df.iloc[-1].to_dict()
+    first = indicator.update(state, bar, length=10)
+    assert indicator.update(state, bar, length=10) == first
+
+def test_incremental_update_unsupported(sample_df):
+    assert VolumeSMA.state_cls is None
+    with pytest.raises(NotImplementedError):
+        VolumeSMA().initial_state(sample_df)
+
 def test_volume_sma(sample_df):
     vsma = VolumeSMA()
     res = vsma.compute(sample_df, period=5)
     assert "value" in res
     assert isinstance(res["value"], float)
 
+def test_volume_sma_matches_pandas_ta(sample_df):
+    expected = ta.sma(sample_df["volume"], length=5).iloc[-1]
+    assert VolumeSMA().compute(sample_df, length=5)["value"] == pytest.approx(expected)
+
 def test_cvd(sample_df):
     cvd = CVD()
     res = cvd.compute(sample_df)
     assert "value" in res
     assert isinstance(res["value"], float)
 
+def test_cvd_signs_volume_by_bar_direction():
+    df = pd.DataFrame({
+        "open": [1.0, 2.0, 3.0],
+        "close": [2.0, 1.0, 3.0],
+        "volume": [10.0, 20.0, 5.0]
+    })
+    assert CVD().compute(df)["value"] == -5.0
+
+def test_cvd_skips_missing_values_like_cumsum():
+    df = pd.DataFrame({
+        "open": [1.0, 2.0, np.nan, 3.0],
+        "close": [2.0, 1.0, 4.0, 3.0],
+        "volume": [10.0, np.nan, 7.0, 5.0]
+    })
+    delta = df["volume"].where(~(df["close"] < df["open"]), -df["volume"])
+    assert CVD().compute(df)["value"] == delta.cumsum().iloc[-1] == 22.0
+    
+    df.loc[3, "volume"] = np.nan
+    assert CVD().compute(df)["value"] is None
+
 def test_compute_indicators_integration(sample_df):
     indicators = {
         "rsi": {"period": 14},
@@ -74,6 +160,56 @@ def test_compute_indicators_integration(sample_df):
         assert "value" in results[name]
         assert results[name]["value"] is not None
 
+def test_compute_indicators_keeps_request_order(sample_df):
+    indicators = {"sma": {"period": 20}, "non_existent": {}, "rsi": {"period": 14}}
+    results = compute_indicators(sample_df, indicators)
+    
+    assert list(results) == list(indicators)
+    assert results["sma"] == SMA().compute(sample_df, period=20)
+    assert "error" in results["non_existent"]
+
+def test_compute_indicators_precision(sample_df):
+    full = SMA().compute(sample_df, length=20)["value"]
+    assert compute_indicators(sample_df, {"sma": {"length": 20}})["sma"]["value"] == full
+    
+    results = compute_indicators(sample_df, {"sma": {"length": 20, "precision": "f32"}})
+    assert results["sma"]["value"] == float(str(np.float32(full)))
+    assert results["sma"]["value"] == pytest.approx(full, rel=1e-6)
+    
+    results = compute_indicators(sample_df, {"sma": {"length": 20, "precision": "f16"}})
+    assert "error" in results["sma"]
+
+def test_indicators_prefer_shared_arrays(sample_df):
+    arrays = {"close": sample_df["close"].to_numpy() + 1.0}
+    res = SMA().compute(sample_df, arrays=arrays, length=10)
+    assert res["value"] == pytest.approx(sample_df["close"].iloc[-10:].mean() + 1.0)
+
+def test_validate_params_memoized():
+    rsi = RSI()
+    merged = rsi.validate_params({"length": 7})
+    assert merged == {"length": 7}
+    assert rsi.validate_params({"length": 7}) is merged
+    assert rsi.validate_params({}) == {"length": 14}
+    with pytest.raises(TypeError):
+        merged["length"] = 8
+    # Equal values of different types are kept apart
+    assert type(rsi.validate_params({"length": 1})["length"]) is int
+    assert rsi.validate_params({"length": True})["length"] is True
+    assert type(rsi.validate_params({"length": 1.0})["length"]) is float
+    # Unhashable values still merge, just without memoization
+    assert rsi.validate_params({"levels": [30, 70]}) == {"length": 14, "levels": [30, 70]}
+
+def test_compute_indicators_with_cache(sample_df):
+    cache = ResultCache()
+    meta = {"ticker": "AAPL", "day": 20230101, "minute": 600, "timeframe": 1, "is_final": True}
+    indicators = {"rsi": {"length": 14}, "sma": {"length": 20}}
+    
+    first = compute_indicators(sample_df, indicators, cache=cache, bar_metadata=meta)
+    # A frame that would compute differently proves the second call is served from cache
+    second = compute_indicators(sample_df.head(30), indicators, cache=cache, bar_metadata=meta)
+    
+    assert second == first
+
 def test_registry_list():
     from indicators.registry import registry
     indicators = registry.list_indicators()
@@ -81,6 +217,16 @@ def test_registry_list():
     names = [i["name"] for i in indicators]
     assert "rsi" in names
     assert "sma" in names
+    indicators[0]["default_params"]["length"] = -1
+    indicators[0]["required_columns"].append("changed")
+    assert registry.list_indicators() == registry.list_indicators() != indicators
+    assert "rsi" in registry and "non_existent" not in registry
+
+def test_registry_is_read_only():
+    from indicators.registry import registry
+    with pytest.raises(TypeError):
+        registry._instances["rsi"] = None
+    assert registry.get_indicator("".join(["r", "s", "i"])).name == "rsi"
 
 def test_invalid_indicator(sample_df):
     results = compute_indicators(sample_df, {"non_existent": {}})
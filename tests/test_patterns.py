@@ -1,5 +1,7 @@
 import pytest
+import numpy as np
 import pandas as pd
+from candlesticks.base import BarWindow, PatternHit, _REGISTRY
 from candlesticks.compute import detect_patterns
 from candlesticks.registry import pattern_registry
 from candlesticks.bullish import Hammer, BullishEngulfing
@@ -25,6 +27,32 @@ class TestPatternRegistry:
         hammer = pattern_registry.get_pattern('hammer')
         assert hammer.name == 'hammer'
         assert hammer.classification == 'bullish'
+    
+    def test_pattern_snapshots(self):
+        """Test that pattern tuples are cached and the sorted view is ordered."""
+        assert pattern_registry.get_all_patterns() is pattern_registry.get_all_patterns()
+        
+        by_bars = pattern_registry.get_patterns_by_required_bars()
+        assert set(by_bars) == set(pattern_registry.get_all_patterns())
+        assert [p.required_bars for p in by_bars] == sorted(p.required_bars for p in by_bars)
+    
+    def test_registry_uses_decorated_instances(self):
+        """Test that the registry reuses the instances created by @register_pattern."""
+        assert pattern_registry.get_all_patterns() == tuple(_REGISTRY)
+        assert len({p.name for p in _REGISTRY}) == len(_REGISTRY) == 20
+    
+    def test_registry_membership_and_listing(self):
+        """Test name membership and that callers can't alter later listings."""
+        assert 'hammer' in pattern_registry
+        assert 'not_a_pattern' not in pattern_registry
+        
+        listing = pattern_registry.list_patterns()
+        listing[0]['name'] = 'changed'
+        listing.clear()
+        assert pattern_registry.list_patterns()[0]['name'] != 'changed'
+        
+        with pytest.raises(ValueError, match="not found"):
+            pattern_registry.get_pattern('not_a_pattern')
 
 
 class TestHammerPattern:
@@ -44,9 +72,9 @@ class TestHammerPattern:
         result = pattern.detect(data)
         
         assert result is not None
-        assert result['name'] == 'hammer'
-        assert result['classification'] == 'bullish'
-        assert result['confidence'] > 0
+        assert result.name == 'hammer'
+        assert result.classification == 'bullish'
+        assert result.confidence > 0
     
     def test_not_hammer_no_long_shadow(self):
         """Test that hammer is not detected without long shadow."""
@@ -61,6 +89,19 @@ class TestHammerPattern:
         result = pattern.detect(data)
         
         assert result is None
+    
+    def test_hammer_from_arrays(self):
+        """Test that detect_from_arrays reads the last bar of whole-series arrays."""
+        o = np.array([100.0, 100.0])
+        h = np.array([103.0, 102.0])
+        l = np.array([99.0, 95.0])
+        c = np.array([102.0, 101.0])
+        
+        result = Hammer().detect_from_arrays(o, h, l, c)
+        
+        assert result is not None
+        assert result.name == 'hammer'
+        assert result.bar_index == 1
 
 
 class TestDojiPattern:
@@ -80,8 +121,8 @@ class TestDojiPattern:
         result = pattern.detect(data)
         
         assert result is not None
-        assert result['name'] == 'doji'
-        assert result['classification'] == 'neutral'
+        assert result.name == 'doji'
+        assert result.classification == 'neutral'
     
     def test_not_doji_large_body(self):
         """Test that doji is not detected with large body."""
@@ -115,8 +156,8 @@ class TestBullishEngulfing:
         result = pattern.detect(data)
         
         assert result is not None
-        assert result['name'] == 'bullish_engulfing'
-        assert result['classification'] == 'bullish'
+        assert result.name == 'bullish_engulfing'
+        assert result.classification == 'bullish'
     
     def test_not_engulfing_no_engulf(self):
         """Test that pattern is not detected without engulfing."""
@@ -164,7 +205,7 @@ class TestDetectPatternsFunction:
         patterns = detect_patterns(data)
         
         assert len(patterns) > 0
-        pattern_names = [p['name'] for p in patterns]
+        pattern_names = [p.name for p in patterns]
         assert 'hammer' in pattern_names
     
     def test_detect_patterns_multiple(self):
@@ -184,9 +225,9 @@ class TestDetectPatternsFunction:
         if len(patterns) > 0:
             # Verify all have required fields
             for p in patterns:
-                assert 'name' in p
-                assert 'classification' in p
-                assert 'confidence' in p
+                assert hasattr(p, 'name')
+                assert hasattr(p, 'classification')
+                assert hasattr(p, 'confidence')
     
     def test_patterns_sorted_by_confidence(self):
         """Test that patterns are sorted by confidence."""
@@ -201,5 +242,84 @@ class TestDetectPatternsFunction:
         
         if len(patterns) > 1:
             # Check descending confidence order
-            confidences = [p['confidence'] for p in patterns]
+            confidences = [p.confidence for p in patterns]
             assert confidences == sorted(confidences, reverse=True)
+    
+    def test_long_history_bar_index(self):
+        """Test that hits on a long frame point at its last bar and match a short frame."""
+        bar = {'open': 100.0, 'high': 102.0, 'low': 95.0, 'close': 101.0}
+        data = pd.DataFrame([bar] * 500)
+        
+        patterns = detect_patterns(data)
+        
+        assert patterns
+        assert all(p.bar_index == 499 for p in patterns)
+        assert [p._replace(bar_index=4) for p in patterns] == detect_patterns(data.tail(5).reset_index(drop=True))
+
+
+class TestBarWindow:
+    """Test the BarWindow wrapper passed to detectors."""
+    
+    def test_window_matches_dataframe(self):
+        """Test that detecting on a BarWindow gives the same result as on the DataFrame."""
+        data = pd.DataFrame({
+            'open': [100.0],
+            'high': [102.0],
+            'low': [95.0],
+            'close': [101.0]
+        })
+        window = BarWindow(data)
+        
+        assert window.ohlc.shape == (4, 1)
+        for pattern in pattern_registry.get_all_patterns():
+            if pattern.required_bars == 1:
+                assert pattern.detect(window) == pattern.detect(data)
+    
+    def test_window_tail(self):
+        """Test that a tail window keeps only the last bars."""
+        data = pd.DataFrame({
+            'open': [1.0, 2.0, 3.0],
+            'high': [4.0, 5.0, 6.0],
+            'low': [0.0, 1.0, 2.0],
+            'close': [2.0, 3.0, 4.0]
+        })
+        
+        np.testing.assert_array_equal(BarWindow(data, tail=2).ohlc, BarWindow(data).ohlc[:, 1:])
+        assert BarWindow(data, tail=10).n == 3
+    
+    def test_window_missing_columns(self):
+        """Test that a window cannot be built without OHLC columns."""
+        data = pd.DataFrame({'open': [100.0], 'close': [101.0]})
+        
+        with pytest.raises(ValueError, match="missing required columns"):
+            BarWindow(data)
+    
+    def test_window_rechecks_changed_columns(self):
+        """Test that dropping a column after a successful check is still caught."""
+        data = pd.DataFrame({
+            'open': [100.0],
+            'high': [102.0],
+            'low': [95.0],
+            'close': [101.0]
+        })
+        BarWindow(data)
+        data.drop(columns=['low'], inplace=True)
+        
+        with pytest.raises(ValueError, match="missing required columns"):
+            BarWindow(data)
+
+
+class TestPatternHit:
+    """Test the PatternHit result type."""
+    
+    def test_confidence_from_percentage(self):
+        """Test that the float confidence is derived from the integer percentage."""
+        hit = PatternHit('hammer', 'bullish', 85, 0)
+        
+        assert hit.confidence == 0.85
+        assert hit.to_dict() == {
+            'name': 'hammer',
+            'classification': 'bullish',
+            'confidence': 0.85,
+            'bar_index': 0
+        }
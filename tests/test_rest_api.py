@@ -1,4 +1,3 @@
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import sys
@@ -7,32 +6,30 @@ import os
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main import app
+from candlesticks.base import PatternHit
 
-client = TestClient(app)
-
-def test_health_check():
-    response = client.get("/health")
+def test_health_check(api_client):
+    response = api_client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok", "service": "ta-engine"}
 
 @patch("server.indicators_tool.registry.list_indicators")
-def test_list_indicators(mock_list):
+def test_list_indicators(mock_list, api_client):
     mock_list.return_value = [{"name": "rsi", "category": "momentum"}]
-    response = client.get("/indicators")
+    response = api_client.get("/indicators")
     assert response.status_code == 200
     assert response.json() == [{"name": "rsi", "category": "momentum"}]
 
 @patch("server.candlestick_tool.pattern_registry.list_patterns")
-def test_list_patterns(mock_list):
+def test_list_patterns(mock_list, api_client):
     mock_list.return_value = [{"name": "Hammer", "classification": "Bullish"}]
-    response = client.get("/candlesticks")
+    response = api_client.get("/candlesticks")
     assert response.status_code == 200
     assert response.json() == [{"name": "Hammer", "classification": "Bullish"}]
 
 @patch("server.indicators_tool.client.fetch_bars")
 @patch("server.indicators_tool.compute_indicators")
-def test_compute_indicators(mock_compute, mock_fetch):
+def test_compute_indicators(mock_compute, mock_fetch, api_client):
     # Mock data
     mock_fetch.return_value = pd.DataFrame([
         {"timestamp": "2023-01-01", "close": 100, "is_final": True}
@@ -45,7 +42,7 @@ def test_compute_indicators(mock_compute, mock_fetch):
         "limit": 100
     }
     
-    response = client.post("/indicators/calculations", json=payload)
+    response = api_client.post("/indicators/calculations", json=payload)
     
     assert response.status_code == 200
     data = response.json()
@@ -54,21 +51,23 @@ def test_compute_indicators(mock_compute, mock_fetch):
 
 @patch("server.candlestick_tool.client.fetch_bars")
 @patch("server.candlestick_tool.detect_patterns")
-def test_detect_candlesticks(mock_detect, mock_fetch):
+def test_detect_candlesticks(mock_detect, mock_fetch, api_client):
     # Mock data
     mock_fetch.return_value = pd.DataFrame([
         {"timestamp": "2023-01-01", "close": 100, "is_final": True}
     ])
-    mock_detect.return_value = [{"name": "Hammer", "confidence": 0.8}]
+    mock_detect.return_value = [PatternHit("hammer", "bullish", 80, 0)]
 
     payload = {
         "ticker": "AAPL",
         "limit": 100
     }
     
-    response = client.post("/candlesticks/detections", json=payload)
+    response = api_client.post("/candlesticks/detections", json=payload)
     
     assert response.status_code == 200
     data = response.json()
     assert data["ticker"] == "AAPL"
-    assert data["patterns"] == [{"name": "Hammer", "confidence": 0.8}]
+    assert data["patterns"] == [
+        {"name": "hammer", "classification": "bullish", "confidence": 0.8, "bar_index": 0}
+    ]
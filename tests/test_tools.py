@@ -7,13 +7,15 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server.indicators_tool import fetch_bars_tool
+from server.bars import last_bar_metadata, last_timestamp
+
+EMPTY_DF = pd.DataFrame([])
 
 @patch("server.indicators_tool.client")
-def test_fetch_bars_tool(mock_client):
+def test_fetch_bars_tool(mock_client, sample_bar_df):
     """Test standard fetch_bars_tool usage"""
     # Setup
-    df = pd.DataFrame([{"close": 100, "timestamp": "2023-01-01"}])
-    mock_client.fetch_bars.return_value = df
+    mock_client.fetch_bars.return_value = sample_bar_df
     
     # Execute
     result = fetch_bars_tool("AAPL", limit=50)
@@ -24,12 +26,11 @@ def test_fetch_bars_tool(mock_client):
     assert result[0]["close"] == 100
     mock_client.fetch_bars.assert_called_with("AAPL", day=None, minute=None, limit=50, timeframe=1)
 
-@patch("mcp_server.tools.client")
+@patch("server.indicators_tool.client")
 def test_fetch_bars_tool_empty(mock_client):
     """Test fetch_bars_tool with empty response"""
     # Setup
-    df = pd.DataFrame([])
-    mock_client.fetch_bars.return_value = df
+    mock_client.fetch_bars.return_value = EMPTY_DF
     
     # Execute
     result = fetch_bars_tool("AAPL")
@@ -37,3 +38,19 @@ def test_fetch_bars_tool_empty(mock_client):
     # Assert
     assert isinstance(result, list)
     assert len(result) == 0
+
+def test_last_bar_helpers():
+    """Test last-bar metadata extraction with and without the optional columns"""
+    df = pd.DataFrame([
+        {"timestamp": "2023-01-01T09:30", "trade_day": 20230101, "minute_of_day": 570, "is_final": True},
+        {"timestamp": "2023-01-01T09:31", "trade_day": 20230101, "minute_of_day": 571, "is_final": False}
+    ])
+    
+    assert last_timestamp(df) == "2023-01-01T09:31"
+    assert last_timestamp(df.head(0)) is None
+    assert last_bar_metadata(df, "AAPL", 1, None, None) == {
+        "ticker": "AAPL", "day": 20230101, "minute": 571, "timeframe": 1, "is_final": False
+    }
+    assert last_bar_metadata(df[["timestamp"]], "AAPL", 5, 20230102, 600) == {
+        "ticker": "AAPL", "day": 20230102, "minute": 600, "timeframe": 5, "is_final": False
+    }
@@ -0,0 +1,129 @@
+import pytest
+import numpy as np
+import pandas as pd
+from candlesticks.compute import detect_all_bars, detect_patterns, detect_patterns_batch, detect_patterns_series
+from candlesticks.registry import pattern_registry
+from candlesticks.base import BarWindow
+from candlesticks.bearish import BEARISH_PATTERNS, detect_all_batch, detect_all_vectorized
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    """Random-walk candles with realistic open/close/shadow structure."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.roll(close, 1) + rng.normal(0, 0.3, n)
+    open_[:1] = close[:1]
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.5, n)) * rng.integers(0, 2, n)
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.5, n)) * rng.integers(0, 2, n)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close})
+
+
+def _prefix_mask(pattern, df: pd.DataFrame) -> np.ndarray:
+    """Reference mask built by calling detect() on every prefix."""
+    mask = np.zeros(len(df), dtype=bool)
+    for i in range(pattern.required_bars - 1, len(df)):
+        mask[i] = pattern.detect(df.iloc[:i + 1]) is not None
+    return mask
+
+
+@pytest.mark.parametrize("pattern", pattern_registry.get_all_patterns(), ids=lambda p: p.name)
+def test_vectorized_matches_detect(pattern):
+    """Test that the vectorized mask agrees with per-bar detection."""
+    df = _random_bars(300, seed=7)
+    
+    mask = pattern.detect_series(df)
+    
+    assert mask.dtype == bool
+    assert len(mask) == len(df)
+    np.testing.assert_array_equal(mask, _prefix_mask(pattern, df))
+
+
+@pytest.mark.parametrize("pattern", pattern_registry.get_all_patterns(), ids=lambda p: p.name)
+def test_vectorized_short_frame(pattern):
+    """Test that frames shorter than the pattern yield an all-False mask."""
+    df = _random_bars(pattern.required_bars - 1, seed=1)
+    
+    mask = pattern.detect_series(df)
+    
+    assert len(mask) == len(df)
+    assert not mask.any()
+
+
+def test_detect_patterns_series():
+    """Test that the per-bar hit frame matches each pattern's own mask."""
+    df = _random_bars(120, seed=3)
+    df.index = pd.RangeIndex(1000, 1120)
+    
+    hits = detect_patterns_series(df)
+    
+    assert hits.index.equals(df.index)
+    assert list(hits.columns) == [p.name for p in pattern_registry.get_all_patterns()]
+    for pattern in pattern_registry.get_all_patterns():
+        np.testing.assert_array_equal(hits[pattern.name].to_numpy(), pattern.detect_series(df))
+
+
+def test_detect_all_bars_confidence():
+    """Test that the confidence column is the best hit confidence on each bar."""
+    df = _random_bars(120, seed=5)
+    
+    frame = detect_all_bars(df)
+    
+    assert list(frame.columns) == [p.name for p in pattern_registry.get_all_patterns()] + ['confidence']
+    for i in range(len(df)):
+        hits = detect_patterns(df.iloc[:i + 1])
+        if hits:
+            assert frame['confidence'].iloc[i] == max(p.confidence for p in hits)
+        else:
+            assert np.isnan(frame['confidence'].iloc[i])
+
+
+def test_detect_patterns_batch_matches_detect():
+    """Test that the parallel batch scan agrees with detect() on every prefix."""
+    df = _random_bars(120, seed=7)
+    
+    frame = detect_patterns_batch(df)
+    
+    assert list(frame.columns) == [p.name for p in pattern_registry.get_all_patterns()]
+    for pattern in pattern_registry.get_all_patterns():
+        column = frame[pattern.name].to_numpy()
+        for i in range(len(df)):
+            hit = pattern.detect(df.iloc[:i + 1]) if i + 1 >= pattern.required_bars else None
+            if hit is None:
+                assert np.isnan(column[i])
+            else:
+                assert int(column[i] * 100.0 + 0.5) == hit.confidence_pct
+
+
+def test_bearish_fused_sweep_matches_per_pattern():
+    """Test that the fused bearish sweep matches each pattern's own mask."""
+    df = _random_bars(300, seed=11)
+    o, h, l, c = (df[col].to_numpy() for col in ('open', 'high', 'low', 'close'))
+    
+    masks = detect_all_vectorized(o, h, l, c)
+    
+    assert set(masks) == {p.name for p in BEARISH_PATTERNS}
+    for pattern in BEARISH_PATTERNS:
+        np.testing.assert_array_equal(masks[pattern.name], pattern.detect_series(df))
+
+
+@pytest.mark.parametrize("pattern", pattern_registry.get_all_patterns(), ids=lambda p: p.name)
+def test_patterns_are_slotted(pattern):
+    """Test that patterns carry no per-instance __dict__."""
+    assert not hasattr(pattern, '__dict__')
+    assert isinstance(pattern.required_bars, int)
+
+
+def test_bearish_batch_matches_per_window():
+    """Test that a stacked multi-ticker sweep matches sweeping each window alone."""
+    windows = [BarWindow(_random_bars(200, seed=seed)) for seed in (3, 5, 8)]
+    
+    masks = detect_all_batch(windows)
+    
+    for name, mask in masks.items():
+        assert mask.shape == (3, 200)
+        for row, window in zip(mask, windows):
+            np.testing.assert_array_equal(row, detect_all_vectorized(*window.ohlc)[name])
+    
+    empty = detect_all_batch([])
+    assert set(empty) == set(masks)
+    assert all(mask.shape == (0, 0) for mask in empty.values())